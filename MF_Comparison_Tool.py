@@ -1,142 +1,123 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import requests
-import matplotlib.pyplot as plt
-from fpdf import FPDF
-import io
 import plotly.graph_objects as go
-from dateutil.relativedelta import relativedelta
+from mf_analytics.amfi import load_scheme_master
+from mf_analytics.batch import load_leaderboard
+from mf_analytics.cache import MetricsCache, cached_fund_metrics, cached_peer_sip_xirr, cached_rolling_sip
+from mf_analytics.correlation import (
+    REDUNDANT_CORRELATION, RETURN_FREQUENCIES, cluster_funds, correlation_matrix, period_returns, rolling_correlation,
+)
+from mf_analytics.downsample import CHART_DEFAULTS, downsample_dict
+from mf_analytics.export import build_workbook, export_key
+from mf_analytics.metrics import MIN_HISTORY
+from mf_analytics.montecarlo import project_funds
+from mf_analytics.panel import NavPanel, align_navs
+from mf_analytics.peers import load_peer_table
+from mf_analytics.portfolio import (
+    CALENDAR_FREQUENCIES, REBALANCE_RULES, backtest, portfolio_summary, weight_grid,
+)
+from mf_analytics.report import ReportJobs, build_report, report_key
+from mf_analytics.risk import RISK_FREE, risk_metrics
+from mf_analytics.rolling import rolling_summary
+from mf_analytics.search import SchemeIndex
+from mf_analytics.sip import SIP_FREQUENCIES, sip_distribution
+from mf_analytics.store import NavStore
 
 # ------------------------- Helper Functions --------------------------
 
-@st.cache_data
+@st.cache_data(ttl=3600)
 def load_amfi_funds():
-    url = "https://www.amfiindia.com/spages/NAVAll.txt"
-    r = requests.get(url)
-    lines = r.text.split("\n")
-    data = []
-    for line in lines:
-        parts = line.split(";")
-        if len(parts) >= 5:
-            scheme_code = parts[0].strip()
-            scheme_name = parts[3].strip()
-            if scheme_code.isdigit():
-                data.append((scheme_code, scheme_name))
-    return pd.DataFrame(data, columns=["SchemeCode", "SchemeName"])
-
-@st.cache_data
-def load_nav_history(scheme_code):
-    url = f"https://api.mfapi.in/mf/{scheme_code}"
-    data = requests.get(url).json()
-    if "data" not in data:
-        return None, None, None
-    df = pd.DataFrame(data["data"])
-    df["nav"] = df["nav"].astype(float)
-    df["date"] = pd.to_datetime(df["date"], format="%d-%m-%Y")
-    df = df.sort_values("date")
-    category = data.get("meta", {}).get("scheme_category", None)
-    return df, category
-
-def compute_rolling_cagr(df, years=5):
-    days = years * 365
-    df = df.set_index("date")
-    df["rolling_cagr"] = ((df["nav"] / df["nav"].shift(days)) ** (1/years) - 1) * 100
-    return df["rolling_cagr"].dropna()
-
-def compute_cagr(df):
-    start = df["nav"].iloc[0]
-    end = df["nav"].iloc[-1]
-    days = (df["date"].iloc[-1] - df["date"].iloc[0]).days
-    years = days / 365
-    return ((end / start) ** (1 / years) - 1) * 100
-
-def xirr(cashflows, dates):
-    def npv(rate):
-        return sum(
-            cf / ((1 + rate) ** ((dt - dates[0]).days / 365))
-            for cf, dt in zip(cashflows, dates)
-        )
-    rate = 0.10
-    for _ in range(200):
-        f = npv(rate)
-        df = sum(
-            -cf * ((dt - dates[0]).days / 365) *
-            (1 + rate) ** (-((dt - dates[0]).days / 365) - 1)
-            for cf, dt in zip(cashflows, dates)
-        )
-        if df == 0:
-            return None
-        new_rate = rate - f / df
-        if abs(new_rate - rate) < 1e-6:
-            return new_rate
-        rate = new_rate
-    return rate
-
-def compute_sip_xirr(nav_df, sip_amount=5000, years=5):
-    end_date = nav_df["date"].iloc[-1]
-    start_date = end_date - relativedelta(years=years)
-    
-    # Filter NAVs for last 5 years
-    nav_df = nav_df[nav_df["date"] >= start_date].copy()
-    
-    # Generate monthly SIP dates
-    sip_dates = pd.date_range(start=start_date, end=end_date, freq='MS')
-    cashflows = []
-    units = 0
-    
-    # Calculate units bought each month
-    for date in sip_dates:
-        nav_on_date = nav_df[nav_df["date"] <= date]["nav"]
-        if len(nav_on_date) == 0:
-            continue  # skip if NAV not available yet
-        nav_val = nav_on_date.iloc[-1]
-        units_bought = sip_amount / nav_val
-        units += units_bought
-        cashflows.append(-sip_amount)
-    
-    # Final redemption value
-    final_nav = nav_df["nav"].iloc[-1]
-    cashflows.append(units * final_nav)
-    sip_dates = list(sip_dates[:len(cashflows)-1]) + [end_date]
-    
-    rate = xirr(cashflows, sip_dates)
-    if rate is not None:
-        return rate * 100
-    return np.nan
-
-def create_pdf(results_df, charts, combined_chart_buf, pdf_xirr_buf):
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    pdf.set_font("helvetica", size=14)
-    pdf.cell(200, 10, "Mutual Fund Comparison Report", ln=True, align="C")
-    pdf.set_font("helvetica", size=11)
-    pdf.ln(5)
-    for _, row in results_df.iterrows():
-        pdf.multi_cell(
-            0, 6,
-            f"Fund: {row['Fund']}\n"
-            f"NAV: {row['NAV']:.2f}\n"
-            f"Annualized CAGR: {row['Annualized CAGR']:.2f}%\n"
-            f"5Y Avg Rolling CAGR: {row['5Y Avg Rolling CAGR']:.2f}%\n"
-            f"5Y SIP XIRR: {row.get('XIRR_5Y_SIP', np.nan):.2f}%\n"
-        )
-        pdf.ln(3)
+    return load_scheme_master()
+
+@st.cache_resource(ttl=3600)
+def get_scheme_index():
+    return SchemeIndex(load_amfi_funds())
+
+@st.cache_data(ttl=3600)
+def get_leaderboard():
+    return load_leaderboard()
+
+@st.cache_resource(ttl=3600)
+def get_peer_table():
+    return load_peer_table()
 
-    # Combined rolling return chart
-    pdf.add_page()
-    pdf.cell(200, 10, "Combined 5-Year Rolling CAGR", ln=True)
-    pdf.image(combined_chart_buf, w=170)
+@st.cache_resource(ttl=3600)
+def get_nav_panel():
+    return NavPanel.open()
 
-    # XIRR chart
-    pdf.add_page()
-    pdf.cell(200, 10, "5-Year SIP XIRR Simulation (Considering Rs. 5000/month)", ln=True)
-    pdf.image(pdf_xirr_buf, w=170)
+@st.cache_resource
+def get_nav_store():
+    return NavStore()
 
-    buf = io.BytesIO()
-    pdf.output(buf)
-    return buf.getvalue()
+@st.cache_resource
+def get_metrics_cache():
+    return MetricsCache()
+
+@st.cache_data(ttl=3600, max_entries=32)
+def get_projections(_nav_frames, data_key, **kwargs):
+    # data_key (scheme code, last NAV date per fund) stands in for hashing the frames
+    return project_funds(_nav_frames, seed=0, **kwargs)
+
+@st.cache_resource
+def get_report_jobs():
+    return ReportJobs()
+
+def background_download(job_id, build, args, button, waiting, **download):
+    """
+    A button that starts build(*args) on the report worker, then a placeholder
+    polled by a fragment so the rest of the page keeps rendering, then the
+    download button once the file is ready.
+    """
+    jobs = get_report_jobs()
+    error = st.session_state.pop(f"failed:{job_id}", None)
+    if error:
+        st.error(f"Could not build the file: {error}")
+    future = jobs.get(job_id)
+    if future is None:
+        if not st.button(button):
+            return
+        future = jobs.submit(job_id, build, *args)
+    if not future.done():
+        @st.fragment(run_every=1)
+        def poll():
+            if future.done():
+                if future.exception() is not None:
+                    st.session_state[f"failed:{job_id}"] = str(future.exception())
+                st.rerun()
+            st.caption(f"⏳ {waiting}")
+        poll()
+    elif future.exception() is not None:
+        st.error(f"Could not build the file: {future.exception()}")
+    else:
+        st.download_button(data=future.result(), **download)
+
+@st.cache_data(ttl=3600)
+def get_category_schemes(category):
+    """{scheme code: name} of every scheme in an AMFI category that has stored NAVs."""
+    index = get_scheme_index()
+    stored = set(get_nav_store().stored_schemes())
+    return {code: name for name, code in index.code_by_name.items()
+            if code in stored and index.category_by_code.get(code) == category}
+
+@st.cache_data(ttl=3600, max_entries=32)
+def get_correlation(_dates, _names, _matrix, data_key, frequency, threshold):
+    # data_key (scheme codes, window start, last NAV date) stands in for hashing the matrix
+    corr = correlation_matrix(_dates, _names, _matrix, frequency)
+    order, groups = cluster_funds(corr, threshold)
+    return corr, order, groups
+
+@st.cache_data(ttl=3600, max_entries=16)
+def get_weight_sweep(_dates, _matrix, data_key, step, rule, frequency, band, sip_amount):
+    # data_key (scheme codes, last NAV date) stands in for hashing the matrix
+    grid = weight_grid(_matrix.shape[1], step)
+    dates, values, rebalances = backtest(_dates, _matrix, grid, rule, frequency, band)
+    labels = ["/".join(f"{w * 100:g}" for w in row) for row in grid]
+    return portfolio_summary(dates, values, rebalances, labels, sip_amount=sip_amount)
+
+# Column name of the benchmark in the risk NAV matrix
+RISK_BENCHMARK_KEY = "__benchmark__"
+# Correlation scope for the selected funds rather than a whole category
+CORR_SELECTED = "__selected__"
 
 # ------------------------- Streamlit UI --------------------------
 
@@ -153,34 +134,93 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 st.title("📊 Mutual Fund Comparison Tool")
-st.write("Select multiple funds and compare metrics including Annualized CAGR, 5-year rolling CAGR, 5-year SIP XIRR, and export to PDF.")
+st.write("Select multiple funds and compare metrics including Annualized CAGR, 5-year rolling CAGR, 5-year SIP XIRR, and export to PDF or Excel.")
 
 # Load AMFI list
-df_amfi = load_amfi_funds()
-fund_names = df_amfi["SchemeName"].tolist()
-selected_funds = st.multiselect("**Select Mutual Funds** (Max 5)", fund_names, max_selections=5)
+scheme_index = get_scheme_index()
+search_col, plan_col, option_col, amc_col = st.columns([3, 1, 1, 2])
+query = search_col.text_input("Search Funds", placeholder="e.g. parag flexi direct growth")
+plan = plan_col.selectbox("Plan", ["Any", "Direct", "Regular"])
+option = option_col.selectbox("Option", ["Any", "Growth", "IDCW"])
+amc = amc_col.selectbox("AMC", ["Any"] + scheme_index.amcs)
+matches = scheme_index.search(
+    query,
+    plan=None if plan == "Any" else plan,
+    option=None if option == "Any" else option,
+    amc=None if amc == "Any" else amc,
+)
+# Keep earlier picks selectable while the search text changes
+already_selected = st.session_state.get("selected_funds", [])
+fund_names = already_selected + [m for m in matches if m not in already_selected]
+selected_funds = st.multiselect("**Select Mutual Funds** (Max 5)", fund_names, max_selections=5, key="selected_funds")
+
+leaderboard = get_leaderboard()
+if leaderboard is not None:
+    with st.expander("🏆 Universe Leaderboard (from the last batch run)"):
+        st.dataframe(leaderboard, width='stretch', hide_index=True)
 if not selected_funds:
     st.stop()
 
+st.sidebar.header("SIP Settings")
+sip_amount = st.sidebar.number_input("SIP Amount (₹)", min_value=100, value=5000, step=500)
+sip_frequency = st.sidebar.selectbox("SIP Frequency", list(SIP_FREQUENCIES), index=1)
+sip_step_up = st.sidebar.number_input("Annual Step-up (%)", min_value=0.0, max_value=100.0, value=0.0, step=5.0)
+sip_label = f"{sip_amount} {sip_frequency}" + (f", {sip_step_up:g}% annual step-up" if sip_step_up else "")
+
+st.sidebar.header("Rolling Returns")
+rolling_threshold = st.sidebar.number_input("Benchmark Return (%)", value=12.0, step=0.5)
+
 results = []
 category_groups = {}
-charts_for_pdf = {}
 rolling_returns_dict = {}
+sip_ledgers = {}
 
 # ------------------- METRIC CALCULATION -------------------
-for fund in selected_funds:
-    scheme_code = df_amfi[df_amfi["SchemeName"] == fund]["SchemeCode"].values[0]
-    nav_df, category = load_nav_history(scheme_code)
-    if nav_df is None or len(nav_df) < 800:
+nav_frames = {}
+fund_categories = {}
+fund_by_code = {scheme_index.code_by_name[fund]: fund for fund in selected_funds}
+
+# Download all selected funds concurrently and list each one as it arrives
+progress = st.progress(0.0, text="Loading NAV history...")
+loaded_table = st.empty()
+loaded_rows = []
+for done, (scheme_code, (nav_df, category)) in enumerate(get_nav_store().history_many(fund_by_code), start=1):
+    fund = fund_by_code[scheme_code]
+    if nav_df is None or len(nav_df) < MIN_HISTORY:
         st.warning(f"Not enough NAV data for {fund}")
-        continue
+    else:
+        nav_frames[fund] = nav_df
+        # AMFI's category matches the batch job's peer tables; mfapi's is the fallback
+        fund_categories[fund] = scheme_index.category_by_code.get(scheme_code) or category
+        loaded_rows.append({
+            "Fund": fund,
+            "Category": fund_categories[fund],
+            "Latest NAV": nav_df["nav"].iloc[-1],
+            "NAV Date": nav_df["date"].iloc[-1].strftime("%d-%b-%Y"),
+        })
+        loaded_table.dataframe(pd.DataFrame(loaded_rows), width='stretch')
+    progress.progress(done / len(fund_by_code), text=f"Loaded {fund}")
+progress.empty()
+loaded_table.empty()
+# Keep the selection order
+nav_frames = {fund: nav_frames[fund] for fund in selected_funds if fund in nav_frames}
 
-    rolling_5yr = compute_rolling_cagr(nav_df)
+# Cached per (scheme, last NAV date, parameters); only new data is recomputed
+fund_codes = {fund: code for code, fund in fund_by_code.items()}
+fund_metrics = cached_fund_metrics(
+    get_metrics_cache(), nav_frames, fund_codes,
+    sip_amount=sip_amount, sip_frequency=sip_frequency, sip_step_up=sip_step_up / 100,
+)
+rolling_all = {fund: m["rolling"] for fund, m in fund_metrics.items()}
+
+for fund, nav_df in nav_frames.items():
+    rolling_5yr = rolling_all[fund]["5Y"].dropna()
     rolling_returns_dict[fund] = rolling_5yr
-    cagr = compute_cagr(nav_df)
-    xirr_5y = compute_sip_xirr(nav_df)
-    
-    category_groups.setdefault(category, []).append(cagr)
+    cagr = fund_metrics[fund]["cagr"]
+    xirr_5y = fund_metrics[fund]["sip_xirr"]
+    sip_ledgers[fund] = fund_metrics[fund]["sip_ledger"]
+
+    category_groups.setdefault(fund_categories[fund], []).append(fund)
     results.append({
         "Fund": fund,
         "NAV": nav_df["nav"].iloc[-1],
@@ -194,10 +234,239 @@ st.header("📋 Comparison Summary Table")
 df_results = pd.DataFrame(results)
 st.dataframe(df_results, width='stretch')
 
+# ------------------- Rolling Return Summary --------------------
+st.header("🔁 Rolling Return Summary (1/3/5/7/10 Years)")
+st.dataframe(rolling_summary(rolling_all, rolling_threshold).style.format(precision=2), width='stretch')
+
+# ------------------- Category Peer Ranking --------------------
+st.header("🏷️ Category Peer Ranking")
+peer_table = get_peer_table()
+if peer_table is None:
+    st.info("Run `python -m mf_analytics.batch` to build the category percentile tables.")
+else:
+    peer_rows = []
+    # The category tables rank a flat monthly SIP (the batch job's); XIRR does not depend on its amount
+    if sip_frequency == "monthly" and not sip_step_up:
+        peer_xirr = {row["Fund"]: row["XIRR_5Y_SIP"] for row in results}
+    else:
+        peer_xirr = cached_peer_sip_xirr(get_metrics_cache(), nav_frames, fund_codes)
+    for category, funds_in_category in category_groups.items():
+        for row in results:
+            if row["Fund"] not in funds_in_category:
+                continue
+            peer_rows.append({
+                "Fund": row["Fund"],
+                "Category": category,
+                "Peers": peer_table.peers.get(category, 0),
+                "CAGR Percentile": peer_table.percentile(category, "CAGR", row["Annualized CAGR"]),
+                "5Y Rolling Percentile": peer_table.percentile(category, "Rolling5Y", row["5Y Avg Rolling CAGR"]),
+                "5Y SIP XIRR Percentile": peer_table.percentile(category, "SIPXIRR5Y", peer_xirr[row["Fund"]]),
+            })
+    st.dataframe(pd.DataFrame(peer_rows).style.format(precision=1), width='stretch', hide_index=True)
+    st.caption(
+        "Percentile rank within the fund's SEBI category (100 = best in category). "
+        "SIP XIRR is ranked for a flat monthly SIP, like the category tables, whatever the SIP settings above."
+    )
+
+# ------------------- Risk Metrics --------------------
+st.header("⚠️ Risk Metrics")
+risk_col, window_col, rf_col = st.columns([3, 1, 1])
+benchmark_query = risk_col.text_input("Benchmark Index Fund", value="nifty 50 index direct growth")
+# A partial match would silently benchmark against an unrelated fund, so every word must match
+benchmark_options = scheme_index.search(benchmark_query, limit=20, match_all=True)
+benchmark_fund = risk_col.selectbox("Benchmark", benchmark_options) if benchmark_options else None
+if benchmark_fund is None:
+    risk_col.info(f"No scheme matches every word of \"{benchmark_query}\"; risk metrics have no benchmark.")
+risk_window = window_col.selectbox("Window", ["3Y", "5Y", "10Y", "Max"], index=1)
+risk_free = rf_col.number_input("Risk-free Rate (%)", value=RISK_FREE * 100, step=0.25) / 100
+
+risk_frames = dict(nav_frames)
+# Scheme code -> latest NAV date, to check the shared panel is not behind the loaded frames
+nav_last = {fund_codes[fund]: df["date"].iloc[-1] for fund, df in nav_frames.items()}
+risk_last = dict(nav_last)
+risk_codes = list(nav_last)
+if benchmark_fund is not None:
+    benchmark_code = scheme_index.code_by_name[benchmark_fund]
+    benchmark_nav, _ = get_nav_store().history(benchmark_code)
+    if benchmark_nav is not None:
+        risk_frames[RISK_BENCHMARK_KEY] = benchmark_nav
+        risk_last[benchmark_code] = benchmark_nav["date"].iloc[-1]
+        risk_codes.append(benchmark_code)
+if nav_frames:
+    last_date = max(df["date"].iloc[-1] for df in nav_frames.values())
+    risk_start = None if risk_window == "Max" else last_date - pd.DateOffset(years=int(risk_window[:-1]))
+    # Read from the shared NAV panel when it is current, else align the loaded frames
+    nav_panel = get_nav_panel()
+    if nav_panel is not None and nav_panel.covers(risk_last):
+        risk_dates, risk_matrix, _ = nav_panel.select(risk_codes, start=risk_start)
+    else:
+        risk_dates, _, risk_matrix = align_navs(risk_frames, start=risk_start)
+    has_benchmark = RISK_BENCHMARK_KEY in risk_frames
+    df_risk = risk_metrics(
+        risk_dates,
+        list(nav_frames),
+        risk_matrix[:, :len(nav_frames)],
+        benchmark=risk_matrix[:, -1] if has_benchmark else None,
+        risk_free=risk_free,
+    )
+    st.dataframe(df_risk.style.format(precision=2), width='stretch')
+    if has_benchmark:
+        st.caption(f"Beta and downside capture against {benchmark_fund}.")
+
+# ------------------- Return Correlation --------------------
+st.header("🔗 Return Correlation & Overlap")
+scope_col, freq_col, corr_window_col, threshold_col = st.columns([3, 1, 1, 1])
+corr_scope = scope_col.selectbox(
+    "Funds", [CORR_SELECTED] + [c for c in category_groups if c is not None],
+    format_func=lambda c: "Selected funds" if c == CORR_SELECTED else f"Whole category: {c}",
+)
+corr_frequency = freq_col.radio("Returns", list(RETURN_FREQUENCIES), horizontal=True)
+corr_window = corr_window_col.selectbox("Window", ["3Y", "5Y", "10Y", "Max"], index=1, key="corr_window")
+corr_threshold = threshold_col.slider("Redundant at Correlation", 0.5, 0.99, REDUNDANT_CORRELATION, step=0.01)
+
+if nav_frames:
+    corr_start = None if corr_window == "Max" else last_date - pd.DateOffset(years=int(corr_window[:-1]))
+    if corr_scope == CORR_SELECTED:
+        corr_names = {fund_codes[fund]: fund for fund in nav_frames}
+    else:
+        corr_names = get_category_schemes(corr_scope)
+    corr_codes = list(corr_names)
+    if corr_scope == CORR_SELECTED:
+        corr_last = nav_last
+    else:
+        stored_last = get_nav_store().last_dates(corr_codes)
+        corr_last = {code: stored_last.get(code) for code in corr_codes}
+    nav_panel = get_nav_panel()
+    if nav_panel is not None and nav_panel.covers(corr_last):
+        corr_dates, corr_matrix, _ = nav_panel.select(corr_codes, start=corr_start)
+    else:
+        # Category members come from the local store only; nothing is downloaded here
+        corr_frames = dict(nav_frames) if corr_scope == CORR_SELECTED else {
+            name: df for name, df in ((corr_names[c], get_nav_store().read(c)) for c in corr_codes) if len(df)
+        }
+        corr_names = {code: name for code, name in corr_names.items() if name in corr_frames}
+        corr_codes = list(corr_names)
+        corr_dates, _, corr_matrix = align_navs(corr_frames, start=corr_start)
+
+    if len(corr_codes) < 2:
+        st.info("Correlation needs at least two funds with stored NAV history.")
+    else:
+        corr_key = (tuple(corr_codes), str(corr_start), str(last_date))
+        corr, corr_order, redundant = get_correlation(
+            corr_dates, list(corr_names.values()), corr_matrix, corr_key, corr_frequency, corr_threshold
+        )
+        # Dendrogram order puts funds that move together next to each other
+        corr = corr.loc[corr_order, corr_order]
+        fig_corr = go.Figure(go.Heatmap(
+            z=corr.to_numpy(), x=corr.columns, y=corr.index, zmin=-1, zmax=1,
+            colorscale="RdBu", reversescale=True, hovertemplate="%{y}<br>%{x}<br>%{z:.2f}<extra></extra>",
+        ))
+        fig_corr.update_layout(height=max(400, min(1200, 25 * len(corr))), xaxis_showticklabels=len(corr) <= 30,
+                               yaxis_showticklabels=len(corr) <= 30, yaxis_autorange="reversed")
+        st.plotly_chart(fig_corr, width='stretch')
+        if redundant:
+            st.markdown(f"**Overlapping picks** (average correlation of {corr_threshold:.2f} or more):")
+            st.dataframe(pd.DataFrame({
+                "Group": range(1, len(redundant) + 1),
+                "Funds": [", ".join(group) for group in redundant],
+                "Count": [len(group) for group in redundant],
+            }), width='stretch', hide_index=True)
+        else:
+            st.caption(f"No funds are correlated at {corr_threshold:.2f} or more.")
+
+        if corr_scope == CORR_SELECTED:
+            # One year of returns per window
+            periods = 252 if corr_frequency == "daily" else 52
+            corr_return_dates, corr_returns = period_returns(corr_dates, corr_matrix, corr_frequency)
+            rolling_corr = rolling_correlation(corr_return_dates, corr_returns, list(corr_names.values()), periods)
+            fig_rolling_corr = go.Figure()
+            for pair, series in downsample_dict(dict(rolling_corr.items()), **CHART_DEFAULTS["rolling_cagr"]).items():
+                fig_rolling_corr.add_trace(go.Scatter(x=series.index, y=series, mode='lines', name=pair))
+            fig_rolling_corr.update_layout(title="1-Year Rolling Correlation", yaxis_title="Correlation",
+                                           yaxis_range=[-1, 1], hovermode="x unified")
+            st.plotly_chart(fig_rolling_corr, width='stretch')
+
+# ------------------- Portfolio Backtest --------------------
+st.header("🧺 Portfolio Backtest")
+if len(nav_frames) < 2:
+    st.info("Select at least two funds to backtest a portfolio of them.")
+else:
+    weight_cols = st.columns(len(nav_frames))
+    target_weights = [
+        col.number_input(f"{fund} (%)", min_value=0.0, max_value=100.0, value=round(100 / len(nav_frames), 1),
+                         step=5.0, key=f"weight_{fund}")
+        for col, fund in zip(weight_cols, nav_frames)
+    ]
+    rule_col, calendar_col, band_col, sweep_col = st.columns(4)
+    rebalance_rule = rule_col.selectbox("Rebalancing", list(REBALANCE_RULES), format_func=REBALANCE_RULES.get)
+    rebalance_frequency = calendar_col.selectbox("Calendar Period", list(CALENDAR_FREQUENCIES), index=1,
+                                                 disabled=rebalance_rule != "calendar")
+    rebalance_band = band_col.number_input("Band (± weight %)", min_value=1.0, max_value=50.0, value=5.0, step=1.0,
+                                           disabled=rebalance_rule != "band") / 100
+    sweep_step = sweep_col.selectbox("Weight Sweep", [None, 25, 20, 10],
+                                     format_func=lambda s: "Off" if s is None else f"Every {s}%")
+
+    # The backtest starts on the first date every selected fund has a NAV
+    portfolio_codes = [fund_codes[fund] for fund in nav_frames]
+    nav_panel = get_nav_panel()
+    if nav_panel is not None and nav_panel.covers(nav_last):
+        portfolio_dates, portfolio_matrix, _ = nav_panel.select(portfolio_codes)
+    else:
+        portfolio_dates, _, portfolio_matrix = align_navs(nav_frames)
+
+    if sum(target_weights) <= 0:
+        st.warning("Give at least one fund a weight above zero.")
+    else:
+        bt_dates, bt_values, bt_rebalances = backtest(
+            portfolio_dates, portfolio_matrix, target_weights, rebalance_rule, rebalance_frequency, rebalance_band
+        )
+        start_row = portfolio_dates.searchsorted(bt_dates[0])
+        fig_portfolio = go.Figure()
+        fig_portfolio.add_trace(go.Scatter(x=bt_dates, y=bt_values[:, 0], mode='lines', name="Portfolio",
+                                           line=dict(width=3)))
+        for j, fund in enumerate(nav_frames):
+            rebased = portfolio_matrix[start_row:, j] / portfolio_matrix[start_row, j] * 100
+            fig_portfolio.add_trace(go.Scatter(x=bt_dates, y=rebased, mode='lines', name=fund, opacity=0.5))
+        fig_portfolio.update_layout(title=f"Growth of 100 since {bt_dates[0]:%d-%b-%Y}", yaxis_title="Value",
+                                    hovermode="x unified")
+        st.plotly_chart(fig_portfolio, width='stretch')
+        st.dataframe(
+            portfolio_summary(bt_dates, bt_values, bt_rebalances, ["Portfolio"], sip_amount=sip_amount)
+            .style.format(precision=2), width='stretch'
+        )
+
+    if sweep_step is not None:
+        sweep_key = (tuple(portfolio_codes), str(last_date))
+        sweep = get_weight_sweep(portfolio_dates, portfolio_matrix, sweep_key, sweep_step / 100,
+                                 rebalance_rule, rebalance_frequency, rebalance_band, sip_amount)
+        st.subheader(f"Weight Sweep ({len(sweep)} portfolios, weights in selection order)")
+        fig_sweep = go.Figure(go.Scatter(
+            x=sweep["Volatility (%)"], y=sweep["CAGR (%)"], mode='markers', text=sweep.index,
+            marker=dict(color=sweep["Sharpe"], colorscale="Viridis", showscale=True, colorbar=dict(title="Sharpe")),
+            hovertemplate="%{text}<br>Volatility %{x:.2f}%<br>CAGR %{y:.2f}%<extra></extra>",
+        ))
+        fig_sweep.update_layout(xaxis_title="Volatility (%)", yaxis_title="CAGR (%)")
+        st.plotly_chart(fig_sweep, width='stretch')
+        st.dataframe(sweep.sort_values("Sharpe", ascending=False).head(20).style.format(precision=2),
+                     width='stretch')
+
 # ------------------- Combined 5-Year Rolling CAGR Chart -------------------
 st.header("📉 5-Year Rolling CAGR (Interactive Combined Chart)")
+rolling_chart = dict(CHART_DEFAULTS["rolling_cagr"])
+with st.expander("Chart Detail"):
+    rolling_chart["max_points"] = st.slider("Points per Fund", 200, 5000, rolling_chart["max_points"], step=100)
+    rolling_chart["method"] = st.radio("Downsampling", ["lttb", "minmax"], horizontal=True,
+                                       format_func={"lttb": "Shape (LTTB)", "minmax": "Min/Max"}.get)
+    chart_dates = [s.index for s in rolling_returns_dict.values() if len(s)]
+    if chart_dates:
+        first = min(d[0] for d in chart_dates).to_pydatetime()
+        last = max(d[-1] for d in chart_dates).to_pydatetime()
+        # Zooming into a shorter range shows more detail for the same point budget
+        rolling_chart["start"], rolling_chart["end"] = st.slider(
+            "Date Range", min_value=first, max_value=last, value=(first, last), format="MMM YYYY"
+        )
 fig_plotly = go.Figure()
-for fund, rolling_5yr in rolling_returns_dict.items():
+for fund, rolling_5yr in downsample_dict(rolling_returns_dict, **rolling_chart).items():
     fig_plotly.add_trace(go.Scatter(
         x=rolling_5yr.index,
         y=rolling_5yr.values,
@@ -215,21 +484,8 @@ fig_plotly.update_layout(
 )
 st.plotly_chart(fig_plotly, width='stretch')
 
-# Save combined chart for PDF
-fig, ax = plt.subplots(figsize=(10, 5))
-for fund, rolling_5yr in rolling_returns_dict.items():
-    ax.plot(rolling_5yr.index, rolling_5yr.values, label=fund)
-ax.set_title("5-Year Rolling CAGR Comparison")
-ax.set_ylabel("Rolling CAGR (%)")
-ax.grid(True)
-ax.legend()
-combined_chart_buf = io.BytesIO()
-plt.savefig(combined_chart_buf, format="png")
-combined_chart_buf.seek(0)
-plt.close(fig)
-
 # ------------------- XIRR Simulation Chart -------------------
-st.header("💰 5-Year SIP XIRR Simulation (Considering ₹ 5000 per month SIP)")
+st.header(f"💰 5-Year SIP XIRR Simulation (Considering ₹ {sip_label} SIP)")
 funds = [r["Fund"] for r in results]
 xirr_values = [r["XIRR_5Y_SIP"] for r in results]
 fig_xirr = go.Figure([go.Bar(x=funds, y=xirr_values, text=[f"{v:.2f}%" for v in xirr_values],
@@ -242,28 +498,125 @@ fig_xirr.update_layout(
 )
 st.plotly_chart(fig_xirr, width='stretch')
 
-# Save XIRR chart for PDF
-fig, ax = plt.subplots(figsize=(8, 4))
-ax.bar(funds, xirr_values, color='blue')
-ax.set_title("5-Year SIP XIRR Simulation")
-ax.set_ylabel("XIRR (%)")
-for i, v in enumerate(xirr_values):
-    ax.text(i, v + 0.5, f"{v:.2f}%", ha='center', fontsize=9)
-pdf_xirr_buf = io.BytesIO()
-plt.savefig(pdf_xirr_buf, format="png")
-pdf_xirr_buf.seek(0)
-plt.close(fig)
+fig_sip = go.Figure()
+for fund, ledger in sip_ledgers.items():
+    fig_sip.add_trace(go.Scatter(
+        x=ledger["date"],
+        y=ledger["value"],
+        mode='lines',
+        name=fund,
+        hovertemplate='Date: %{x|%d-%b-%Y}<br>Value: ₹%{y:,.0f}<extra></extra>'
+    ))
+if sip_ledgers:
+    invested = next(iter(sip_ledgers.values()))
+    fig_sip.add_trace(go.Scatter(x=invested["date"], y=invested["invested"], mode='lines',
+                                 name="Amount Invested", line=dict(dash='dash', color='grey')))
+fig_sip.update_layout(
+    title="SIP Portfolio Value",
+    yaxis_title="Value (₹)",
+    hovermode="x unified",
+    template="plotly_white",
+    height=400
+)
+st.plotly_chart(fig_sip, width='stretch')
+
+# ------------------- Rolling SIP XIRR Distribution -------------------
+st.header("🎯 Rolling SIP XIRR (Every Monthly Start Date)")
+sip_horizon = st.selectbox("SIP Horizon (Years)", [3, 5, 7, 10], index=1)
+rolling_sips = cached_rolling_sip(get_metrics_cache(), nav_frames, fund_codes, sip_horizon)
+fig_dist = go.Figure()
+for fund, dist in rolling_sips.items():
+    fig_dist.add_trace(go.Box(y=dist["xirr"], name=fund, boxpoints=False))
+fig_dist.update_layout(
+    title=f"{sip_horizon}-Year SIP XIRR Across All Start Months",
+    yaxis_title="XIRR (%)",
+    template="plotly_white",
+    showlegend=False,
+    height=450
+)
+st.plotly_chart(fig_dist, width='stretch')
+st.dataframe(
+    pd.DataFrame({fund: sip_distribution(dist) for fund, dist in rolling_sips.items()}).T,
+    width='stretch'
+)
+
+# ------------------- Projected Outcomes (Bootstrap) -------------------
+st.header("🔮 Projected Outcomes (Block Bootstrap of Monthly Returns)")
+mode_col, amount_col, years_col, paths_col = st.columns(4)
+projection_mode = mode_col.radio("Investment", ["sip", "lumpsum"], horizontal=True,
+                                 format_func={"sip": "Monthly SIP", "lumpsum": "Lumpsum"}.get)
+projection_amount = amount_col.number_input("Amount (₹)", min_value=100, value=5000 if projection_mode == "sip" else 100000,
+                                            step=1000, key=f"projection_amount_{projection_mode}")
+projection_years = years_col.slider("Years", 1, 30, 10)
+projection_paths = paths_col.select_slider("Paths", [1000, 5000, 10000, 20000], value=10000)
+projections = get_projections(
+    nav_frames, tuple((fund_codes[f], df["date"].iloc[-1]) for f, df in nav_frames.items()),
+    years=projection_years, amount=projection_amount, mode=projection_mode, paths=projection_paths,
+)
+projection_title = (
+    f"Projected Corpus: {'Rs. ' + format(projection_amount, ',')} "
+    f"{'monthly SIP' if projection_mode == 'sip' else 'lumpsum'} over {projection_years} years"
+)
+fig_proj = go.Figure()
+for fund, bands in projections.items():
+    years_axis = bands["Month"] / 12
+    fig_proj.add_trace(go.Scatter(x=years_axis, y=bands["P90"], mode='lines', line=dict(width=0),
+                                  showlegend=False, hoverinfo='skip', legendgroup=fund))
+    fig_proj.add_trace(go.Scatter(x=years_axis, y=bands["P10"], mode='lines', line=dict(width=0),
+                                  fill='tonexty', showlegend=False, hoverinfo='skip', legendgroup=fund))
+    fig_proj.add_trace(go.Scatter(x=years_axis, y=bands["P50"], mode='lines', name=fund, legendgroup=fund,
+                                  hovertemplate='Year %{x:.1f}<br>Median: ₹%{y:,.0f}<extra></extra>'))
+if projections:
+    first = next(iter(projections.values()))
+    fig_proj.add_trace(go.Scatter(x=first["Month"] / 12, y=first["Invested"], mode='lines',
+                                  name="Amount Invested", line=dict(dash='dash', color='grey')))
+fig_proj.update_layout(
+    title=projection_title.replace("Rs. ", "₹"),
+    xaxis_title="Years",
+    yaxis_title="Corpus (₹)",
+    hovermode="x unified",
+    template="plotly_white",
+    height=500
+)
+st.plotly_chart(fig_proj, width='stretch')
+st.dataframe(
+    pd.DataFrame({
+        fund: {
+            "Invested": bands["Invested"].iloc[-1],
+            "10th Percentile": bands["P10"].iloc[-1],
+            "Median": bands["P50"].iloc[-1],
+            "90th Percentile": bands["P90"].iloc[-1],
+        }
+        for fund, bands in projections.items()
+    }).T.style.format("₹{:,.0f}"),
+    width='stretch'
+)
+st.caption("Based on random 12-month blocks of each fund's past monthly returns; not a forecast.")
 
 # ----------------- Export to PDF -----------------------
 st.header("📄 Download PDF Report")
-pdf_data = create_pdf(df_results, charts_for_pdf, combined_chart_buf, pdf_xirr_buf)
-st.download_button(
+# Built on a background worker only when asked for, and reused while the inputs are unchanged
+report_args = (df_results, rolling_returns_dict, f"Rs. {sip_label}", projections, projection_title)
+report_id = report_key(*report_args)
+background_download(
+    report_id, build_report, report_args, "Generate PDF Report", "Building PDF report...",
     label="Download PDF Report",
-    data=pdf_data,
     file_name="MF_Comparison_Report.pdf",
     mime="application/pdf"
 )
 
+# ----------------- Export to Excel -----------------------
+st.header("📥 Download Excel Data")
+# NAV history, rolling CAGR and SIP ledger per fund, built and cached like the PDF
+excel_funds = [(fund, nav_frames[fund], rolling_all[fund], sip_ledgers[fund]) for fund in nav_frames]
+excel_id = "xlsx:" + export_key(df_results, nav_frames, rolling_all, sip_ledgers)
+background_download(
+    excel_id, build_workbook, (df_results, excel_funds), "Generate Excel Workbook", "Building Excel workbook...",
+    label="Download Excel Workbook",
+    file_name="MF_Comparison_Data.xlsx",
+    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
 # Footer
 st.markdown("---")
 st.markdown("**Note:** " \
@@ -1,40 +1,23 @@
 import streamlit as st
-import requests
+from weather_client import ApiError, CityNotFound, get_client
 
 # --- Configuration ---
-# ⚠️ IMPORTANT: Replace 'YOUR_API_TOKEN' with your actual token from a service like aqicn.org
-API_TOKEN = 'ac73ef45573497db6e37f3135880f86ba063caf1'
-BASE_URL = "https://api.waqi.info/feed/"
+# The WAQI token (WAQI_TOKEN) lives in weather_client, shared with the weather dashboards
+client = get_client()
 
 # --- Functions ---
 
-@st.cache_data(ttl=600)  # Cache the result for 10 minutes to avoid hitting API limits
 def get_aqi_data(city_name):
-    """Fetches AQI data for a given city using the WAQI API."""
-    if not API_TOKEN or API_TOKEN == 'YOUR_API_TOKEN':
-        return {"error": "API Token is missing. Please replace 'YOUR_API_TOKEN' in the code."}
-
-    # The API query uses the city name directly
-    api_url = f"{BASE_URL}{city_name}/?token={API_TOKEN}"
-    
+    """AirQuality for a city from the WAQI API, or an error message."""
     try:
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-        data = response.json()
-        
-        if data.get("status") == "ok" and data.get("data", {}).get("aqi") is not None:
-            return data["data"]
-        elif data.get("status") == "ok" and data.get("data", {}).get("aqi") == '-':
-            return {"error": f"AQI data not available for '{city_name}'. The station might not be reporting the main AQI."}
-        elif data.get("status") == "error":
-             return {"error": f"API Error: {data.get('data')} for city '{city_name}'"}
-        else:
-            return {"error": f"City '{city_name}' not found or no AQI data available."}
-
-    except requests.exceptions.Timeout:
-        return {"error": "API request timed out."}
-    except requests.exceptions.RequestException as e:
-        return {"error": f"An error occurred during the API request: {e}"}
+        air = client.air_quality(city_name)
+    except CityNotFound as e:
+        return None, f"City '{city_name}' not found or no AQI data available. ({e})"
+    except ApiError as e:
+        return None, f"An error occurred during the API request: {e}"
+    if air.aqi is None:
+        return None, f"AQI data not available for '{city_name}'. The station might not be reporting the main AQI."
+    return air, None
 
 def get_aqi_category(aqi_value):
     """Determines the AQI health category and color based on the US EPA standard."""
@@ -78,16 +61,16 @@ if st.button("Get AQI"):
     else:
         # Display a loading spinner while fetching data
         with st.spinner(f"Fetching AQI for **{city_input}**..."):
-            aqi_data = get_aqi_data(city_input)
+            aqi_data, error = get_aqi_data(city_input)
 
-            if "error" in aqi_data:
-                st.error(aqi_data["error"])
+            if error:
+                st.error(error)
             else:
                 # Extract main data
-                aqi = aqi_data["aqi"]
-                category, color = get_aqi_category(int(aqi))
-                station_name = aqi_data.get("city", {}).get("name", "N/A")
-                pollutants = aqi_data.get("iaqi", {})
+                aqi = aqi_data.aqi
+                category, color = get_aqi_category(aqi)
+                station_name = aqi_data.station
+                pollutants = aqi_data.pollutants
                 
                 st.success(f"✅ Data fetched successfully for **{station_name}**")
                 st.write("---")
@@ -111,7 +94,7 @@ if st.button("Get AQI"):
                 cols = [col1, col2, col3]
                 
                 pollutant_names = {
-                    'p2': 'PM2.5', 'p1': 'PM10', 'o3': 'Ozone (O₃)', 
+                    'pm25': 'PM2.5', 'pm10': 'PM10', 'o3': 'Ozone (O₃)', 
                     'no2': 'Nitrogen Dioxide (NO₂)', 'so2': 'Sulfur Dioxide (SO₂)', 
                     'co': 'Carbon Monoxide (CO)'
                 }
@@ -120,10 +103,10 @@ if st.button("Get AQI"):
                     if key in pollutant_names:
                          cols[i % 3].metric(
                             label=pollutant_names[key], 
-                            value=f"{value['v']} µg/m³"
+                            value=f"{value} µg/m³"
                         )
                 
                 st.write("---")
                 st.info(
-                    f"Last reported measurement time: **{aqi_data.get('time', {}).get('s', 'N/A')}**"
+                    f"Last reported measurement time: **{aqi_data.time or 'N/A'}**"
                 )
\ No newline at end of file
@@ -0,0 +1 @@
+"""Offline benchmarks for the Mutual Fund Comparison Tool computations."""
@@ -0,0 +1,111 @@
+"""
+Throughput and tail latency of the HTTP layer against the stand-in APIs.
+
+    python -m benchmarks.loadtest --requests 2000 --concurrency 16 --latency 50 --jitter 50 --error-rate 0.02
+    python -m benchmarks.loadtest --upstream http://127.0.0.1:8765   # a server started separately
+
+Without --upstream an in-process benchmarks.mockserver is started with the
+given latency and error injection. Requests go through
+mf_analytics.http.make_session, so pooling, retries and the transport are
+the ones the apps use. The API mix defaults to NAV histories, WeatherAPI
+and WAQI; the AMFI scheme list can be added with --mix.
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from benchmarks.mockserver import FIRST_CODE, make_server
+from mf_analytics.http import TIMEOUT, make_session
+
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Chennai", "Kolkata", "Pune", "Hyderabad", "Jaipur"]
+
+
+def target_urls(kind, rng):
+    if kind == "mfapi":
+        return f"https://api.mfapi.in/mf/{FIRST_CODE + rng.randrange(2000)}"
+    if kind == "amfi":
+        return "https://www.amfiindia.com/spages/NAVAll.txt"
+    if kind == "weather":
+        endpoint = rng.choice(["current.json", "forecast.json?days=2", "astronomy.json"])
+        sep = "&" if "?" in endpoint else "?"
+        return f"https://api.weatherapi.com/v1/{endpoint}{sep}key=test&q={rng.choice(CITIES)}"
+    if kind == "waqi":
+        return f"https://api.waqi.info/feed/{rng.choice(CITIES)}/?token=test"
+    raise ValueError(f"Unknown target: {kind}")
+
+
+def run_load(session, urls, concurrency):
+    """(per-request seconds, status or exception name, total wall seconds)."""
+    latencies = np.empty(len(urls))
+    outcomes = [None] * len(urls)
+
+    def fetch(i):
+        start = time.perf_counter()
+        try:
+            r = session.get(urls[i], timeout=TIMEOUT)
+            r.content
+            outcomes[i] = r.status_code
+        except requests.RequestException as e:
+            outcomes[i] = type(e).__name__
+        latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(fetch, range(len(urls))))
+    return latencies, outcomes, time.perf_counter() - start
+
+
+def report(latencies, outcomes, wall):
+    ok = sum(1 for o in outcomes if o == 200)
+    print(f"requests      {len(outcomes)}")
+    print(f"succeeded     {ok} ({ok / len(outcomes):.1%})")
+    failures = {}
+    for o in outcomes:
+        if o != 200:
+            failures[o] = failures.get(o, 0) + 1
+    for outcome, count in sorted(failures.items(), key=lambda kv: -kv[1]):
+        print(f"  {outcome:<12}{count}")
+    print(f"throughput    {len(outcomes) / wall:.1f} req/s")
+    for p in (50, 90, 95, 99):
+        print(f"p{p:<12}{np.percentile(latencies, p) * 1000:.1f} ms")
+    print(f"max           {latencies.max() * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the HTTP layer against the stand-in APIs.")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", default="mfapi,weather,waqi", help="comma-separated: mfapi, amfi, weather, waqi")
+    parser.add_argument("--upstream", help="use an already running stand-in server")
+    parser.add_argument("--latency", type=float, default=20.0, help="ms, in-process server only")
+    parser.add_argument("--jitter", type=float, default=20.0, help="ms, in-process server only")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="in-process server only")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = None
+    upstream = args.upstream
+    if upstream is None:
+        server = make_server(port=0, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                             seed=args.seed)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        upstream = f"http://127.0.0.1:{server.server_port}"
+
+    rng = random.Random(args.seed)
+    kinds = args.mix.split(",")
+    urls = [target_urls(rng.choice(kinds), rng) for _ in range(args.requests)]
+    session = make_session(max_workers=args.concurrency, mode="live", upstream=upstream)
+    try:
+        report(*run_load(session, urls, args.concurrency))
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
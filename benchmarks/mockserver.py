@@ -0,0 +1,270 @@
+"""
+Local stand-in for AMFI, mfapi.in, WeatherAPI and WAQI.
+
+    python -m benchmarks.mockserver --port 8765 --latency 80 --jitter 40 --error-rate 0.02
+    MF_HTTP_UPSTREAM=http://127.0.0.1:8765 streamlit run MF_Comparison_Tool.py
+
+Requests arrive as /<original host>/<original path> (see
+mf_analytics.transport.redirect). Responses have the shape of the real APIs
+and are deterministic per scheme code or city. Every request first waits
+--latency ms plus up to --jitter ms of random extra delay. After that, a
+--error-rate fraction get a 503, and a --stall-rate fraction stall for
+--stall ms before answering, to exercise client timeouts.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from benchmarks.synthetic import END_DATE, synthetic_nav
+
+CATEGORIES = [
+    "Equity Scheme - Large Cap Fund",
+    "Equity Scheme - Flexi Cap Fund",
+    "Equity Scheme - Mid Cap Fund",
+    "Debt Scheme - Liquid Fund",
+    "Hybrid Scheme - Aggressive Hybrid Fund",
+]
+AMCS = ["Alpha Mutual Fund", "Beta Mutual Fund", "Gamma Mutual Fund", "Delta Mutual Fund"]
+FIRST_CODE = 100000
+
+
+def _seed(*parts):
+    return int(hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:8], 16)
+
+
+def scheme_name(code):
+    plan = "Direct" if code % 2 else "Regular"
+    option = "Growth" if code % 3 else "IDCW"
+    return f"{AMCS[code % len(AMCS)].split()[0]} Fund {code} - {plan} Plan - {option}"
+
+
+def scheme_nav(code):
+    rng = np.random.default_rng(_seed("years", code))
+    return synthetic_nav(rng.uniform(1, 20), seed=_seed("nav", code))
+
+
+def navall_text(n_schemes):
+    """NAVAll.txt for `n_schemes` schemes, grouped by category and AMC like AMFI's file."""
+    lines = ["Scheme Code;ISIN Div Payout/ ISIN Growth;ISIN Div Reinvestment;Scheme Name;Net Asset Value;Date", ""]
+    date = END_DATE.strftime("%d-%b-%Y")
+    codes = range(FIRST_CODE, FIRST_CODE + n_schemes)
+    for c, category in enumerate(CATEGORIES):
+        lines += [f"Open Ended Schemes({category})", ""]
+        for a, amc in enumerate(AMCS):
+            members = [code for code in codes if code % len(CATEGORIES) == c and code % len(AMCS) == a]
+            if not members:
+                continue
+            lines += [amc, ""]
+            for code in members:
+                nav = 10 + _seed("last", code) % 9000 / 10
+                lines.append(f"{code};INF{code:09d};-;{scheme_name(code)};{nav:.4f};{date}")
+            lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def mfapi_json(code, start_date=None):
+    nav_df = scheme_nav(code)
+    if start_date:
+        nav_df = nav_df[nav_df["date"] >= start_date]
+    rows = nav_df.iloc[::-1]  # newest first, as mfapi returns them
+    return {
+        "meta": {
+            "fund_house": AMCS[code % len(AMCS)],
+            "scheme_type": "Open Ended Schemes",
+            "scheme_category": CATEGORIES[code % len(CATEGORIES)],
+            "scheme_code": code,
+            "scheme_name": scheme_name(code),
+        },
+        "data": [
+            {"date": d.strftime("%d-%m-%Y"), "nav": f"{v:.5f}"}
+            for d, v in zip(rows["date"], rows["nav"])
+        ],
+        "status": "SUCCESS",
+    }
+
+
+def _conditions(rng, aqi=False):
+    temp_c = round(float(rng.uniform(5, 38)), 1)
+    conditions = {
+        "temp_c": temp_c,
+        "temp_f": round(temp_c * 9 / 5 + 32, 1),
+        "feelslike_c": round(temp_c + float(rng.uniform(-3, 3)), 1),
+        "feelslike_f": round((temp_c + 1) * 9 / 5 + 32, 1),
+        "humidity": int(rng.integers(15, 100)),
+        "wind_kph": round(float(rng.uniform(0, 40)), 1),
+        "vis_km": round(float(rng.uniform(1, 10)), 1),
+        "pressure_mb": int(rng.integers(990, 1030)),
+        "uv": round(float(rng.uniform(0, 11)), 1),
+        "condition": {"text": "Partly cloudy", "icon": "//cdn.weatherapi.com/weather/64x64/day/116.png"},
+    }
+    if aqi:
+        conditions["air_quality"] = {
+            "pm2_5": round(float(rng.uniform(5, 150)), 1),
+            "pm10": round(float(rng.uniform(10, 250)), 1),
+            "us-epa-index": int(rng.integers(1, 7)),
+        }
+    return conditions
+
+
+def _location(city, now):
+    rng = np.random.default_rng(_seed("loc", city.lower()))
+    return {
+        "name": city.title(),
+        "country": "Testland",
+        "lat": round(float(rng.uniform(-60, 60)), 2),
+        "lon": round(float(rng.uniform(-180, 180)), 2),
+        "localtime": now.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def _astro():
+    return {"sunrise": "06:12 AM", "sunset": "06:41 PM", "moonrise": "08:03 PM", "moonset": "07:20 AM"}
+
+
+def weather_json(endpoint, query):
+    city = query.get("q", [""])[0]
+    if not city.strip():
+        return 400, {"error": {"code": 1003, "message": "Parameter q is missing."}}
+    if city.lower().startswith("nowhere"):
+        return 400, {"error": {"code": 1006, "message": "No matching location found."}}
+    now = datetime(2025, 6, 13, 14, 0)
+    rng = np.random.default_rng(_seed("weather", city.lower()))
+    aqi = query.get("aqi", ["no"])[0] == "yes"
+    body = {"location": _location(city, now)}
+    if endpoint in ("current.json", "forecast.json"):
+        body["current"] = _conditions(rng, aqi)
+    if endpoint == "astronomy.json":
+        body["astronomy"] = {"astro": _astro()}
+    if endpoint == "forecast.json":
+        days = []
+        for d in range(int(query.get("days", ["1"])[0])):
+            day = now.date() + timedelta(days=d)
+            hours = []
+            for h in range(24):
+                hour = _conditions(rng, aqi)
+                hour["time"] = f"{day} {h:02d}:00"
+                hours.append(hour)
+            temps = [hour["temp_c"] for hour in hours]
+            days.append({
+                "date": str(day),
+                "day": {
+                    "maxtemp_c": max(temps), "mintemp_c": min(temps),
+                    "maxtemp_f": round(max(temps) * 9 / 5 + 32, 1), "mintemp_f": round(min(temps) * 9 / 5 + 32, 1),
+                    "avgtemp_c": round(sum(temps) / 24, 1), "avghumidity": hours[12]["humidity"],
+                    "maxwind_kph": max(hour["wind_kph"] for hour in hours), "uv": max(hour["uv"] for hour in hours),
+                    "daily_chance_of_rain": int(rng.integers(0, 100)), "condition": hours[12]["condition"],
+                },
+                "astro": _astro(),
+                "hour": hours,
+            })
+        body["forecast"] = {"forecastday": days}
+    return 200, body
+
+
+def waqi_json(city):
+    if city.lower().startswith("nowhere"):
+        return {"status": "error", "data": "Unknown station"}
+    rng = np.random.default_rng(_seed("aqi", city.lower()))
+    iaqi = {p: {"v": round(float(rng.uniform(1, 200)), 1)} for p in ("pm25", "pm10", "o3", "no2", "so2", "co")}
+    return {
+        "status": "ok",
+        "data": {
+            "aqi": int(rng.integers(10, 320)),
+            "idx": _seed("idx", city) % 10000,
+            "city": {"name": city.title(), "geo": [0.0, 0.0]},
+            "dominentpol": "pm25",
+            "iaqi": iaqi,
+            "time": {"s": "2025-06-13 14:00:00"},
+        },
+    }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            delay = server.latency + server.rng.uniform(0, server.jitter)
+            fail = server.rng.random() < server.error_rate
+            stall = server.rng.random() < server.stall_rate
+        time.sleep((delay + (server.stall if stall else 0)) / 1000)
+        if fail:
+            return self._send(503, {"error": "injected failure"})
+
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        query = parse_qs(parts.query)
+        if host == "www.amfiindia.com" and path == "spages/NAVAll.txt":
+            return self._send(200, navall_text(server.schemes), "text/plain")
+        if host == "api.mfapi.in" and path.startswith("mf/"):
+            code = path[3:].strip("/")
+            if not code.isdigit():
+                return self._send(404, {"status": "ERROR"})
+            return self._send(200, mfapi_json(int(code), query.get("startDate", [None])[0]))
+        if host == "api.weatherapi.com" and path.startswith("v1/"):
+            status, body = weather_json(path[3:], query)
+            return self._send(status, body)
+        if host == "api.waqi.info" and path.startswith("feed/"):
+            return self._send(200, waqi_json(unquote(path[5:].strip("/"))))
+        self._send(404, {"error": f"unknown endpoint {host}/{path}"})
+
+
+def make_server(host="127.0.0.1", port=8765, latency=0.0, jitter=0.0, error_rate=0.0,
+                stall_rate=0.0, stall=30000.0, schemes=2000, seed=0, verbose=False):
+    """ThreadingHTTPServer for the stand-in APIs (latencies in milliseconds)."""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.latency, server.jitter, server.stall = latency, jitter, stall
+    server.error_rate, server.stall_rate = error_rate, stall_rate
+    server.schemes, server.verbose = schemes, verbose
+    server.rng, server.lock = random.Random(seed), threading.Lock()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve stand-ins for AMFI, mfapi.in, WeatherAPI and WAQI.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="base delay per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay up to this (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="fraction of requests that stall")
+    parser.add_argument("--stall", type=float, default=30000.0, help="stall duration (ms)")
+    parser.add_argument("--schemes", type=int, default=2000, help="schemes listed in NAVAll.txt")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                         args.stall_rate, args.stall, args.schemes, args.seed, args.verbose)
+    print(f"Serving stand-in APIs on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Offline benchmarks for the MF computations, on synthetic NAV histories.
+
+    python -m benchmarks.run                        # time against the stored baseline
+    python -m benchmarks.run --funds 1,50,500,5000  # larger universes
+    python -m benchmarks.run --update               # record a new baseline
+
+Every case is run once untimed, so one-off costs such as lazy imports are
+not counted, then timed as the best of --repeat runs, then run once more under
+tracemalloc for its peak memory. A case slower (or heavier) than its baseline
+times --tolerance fails the run with exit status 1. Baselines depend on the
+machine, so record one with --update before comparing on new hardware.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_universe
+from mf_analytics.metrics import compute_cagr, compute_rolling_cagr, compute_sip_xirr, scheme_metrics
+from mf_analytics.panel import align_navs
+from mf_analytics.report import build_report
+from mf_analytics.risk import risk_metrics
+from mf_analytics.rolling import rolling_cagr
+from mf_analytics.sip import simulate_sip
+from mf_analytics.xirr import xirr, xirr_ragged
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+TOLERANCE = 1.5
+# The PDF report is built for a handful of selected funds, never the universe
+PDF_FUNDS = 5
+
+
+def _sips(universe):
+    return [sip for sip in (simulate_sip(df) for df in universe.values()) if len(sip.ledger)]
+
+
+def case_xirr(universe):
+    sips = _sips(universe)
+    return lambda: [xirr(sip.cashflows, sip.dates) for sip in sips]
+
+
+def case_xirr_ragged(universe):
+    series = [(sip.cashflows, sip.dates) for sip in _sips(universe)]
+    return lambda: xirr_ragged(series)
+
+
+def case_compute_sip_xirr(universe):
+    return lambda: [compute_sip_xirr(df) for df in universe.values()]
+
+
+def case_compute_rolling_cagr(universe):
+    return lambda: [compute_rolling_cagr(df) for df in universe.values()]
+
+
+def case_compute_cagr(universe):
+    return lambda: [compute_cagr(df) for df in universe.values()]
+
+
+def case_rolling_cagr(universe):
+    return lambda: rolling_cagr(universe)
+
+
+def case_scheme_metrics(universe):
+    return lambda: scheme_metrics(universe)
+
+
+def case_risk_metrics(universe):
+    return lambda: risk_metrics(*align_navs(universe))
+
+
+def case_create_pdf(funds):
+    metrics = scheme_metrics(funds)
+    results = pd.DataFrame({
+        "Fund": [f"Fund {code}" for code in funds],
+        "NAV": metrics["NAV"],
+        "Annualized CAGR": metrics["CAGR"],
+        "5Y Avg Rolling CAGR": metrics["Rolling5Y"],
+        "XIRR_5Y_SIP": metrics["SIPXIRR5Y"],
+    })
+    rolling = rolling_cagr(funds, horizons=(5,))
+    rolling_returns = {
+        f"Fund {code}": frame.set_index(funds[code]["date"])["5Y"].dropna() for code, frame in rolling.items()
+    }
+    return lambda: build_report(results, rolling_returns, "Rs. 5000/month")
+
+
+# name -> (builder, most funds it runs on, None for every universe size)
+CASES = {
+    "xirr": (case_xirr, None),
+    "xirr_ragged": (case_xirr_ragged, None),
+    "compute_sip_xirr": (case_compute_sip_xirr, None),
+    "compute_rolling_cagr": (case_compute_rolling_cagr, None),
+    "compute_cagr": (case_compute_cagr, None),
+    "rolling_cagr": (case_rolling_cagr, None),
+    "scheme_metrics": (case_scheme_metrics, None),
+    "risk_metrics": (case_risk_metrics, None),
+    "create_pdf": (case_create_pdf, PDF_FUNDS),
+}
+
+
+def measure(fn, repeat):
+    """(best seconds of `repeat` runs after a warm-up run, peak traced MB of one more run)."""
+    # The first call pays lazy imports (fpdf, matplotlib for create_pdf) that are not the case's cost
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 2 ** 20
+
+
+def run(sizes, cases, repeat, seed=0):
+    results = {}
+    for n in sizes:
+        universe = synthetic_universe(n, seed=seed)
+        for name in cases:
+            builder, max_funds = CASES[name]
+            size = n if max_funds is None else min(n, max_funds)
+            key = f"{name}/{size}"
+            if key in results:
+                continue
+            funds = universe if size == n else dict(list(universe.items())[:size])
+            results[key] = measure(builder(funds), repeat)
+            _print(key, *results[key])
+    return {key: {"seconds": s, "peak_mb": mb} for key, (s, mb) in results.items()}
+
+
+def _print(key, seconds, peak_mb):
+    print(f"{key:<28} {seconds * 1000:>11.2f} ms {peak_mb:>10.1f} MB", flush=True)
+
+
+def compare(results, baseline, tolerance):
+    """Messages for every case that regressed beyond `tolerance` times its baseline."""
+    failures = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for field, unit in (("seconds", "s"), ("peak_mb", "MB")):
+            # Small absolute floors keep sub-millisecond and sub-MB noise from failing the run
+            floor = 0.005 if field == "seconds" else 1.0
+            limit = max(base[field] * tolerance, base[field] + floor)
+            if current[field] > limit:
+                failures.append(
+                    f"{key}: {field} {current[field]:.4g}{unit} > {limit:.4g}{unit} "
+                    f"(baseline {base[field]:.4g}{unit})"
+                )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the MF computations on synthetic NAV histories.")
+    parser.add_argument("--funds", default="1,50,500", help="comma-separated universe sizes (up to 5000)")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated case names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--report", help="also write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    sizes = sorted(int(n) for n in args.funds.split(","))
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = run(sizes, cases, args.repeat, args.seed)
+    document = {
+        "machine": f"{platform.machine()} {platform.processor() or platform.system()}",
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+
+    if args.update:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f).get("results", {})
+        document["results"] = {**baseline, **results}
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to record one.")
+        return 0
+    with open(args.baseline) as f:
+        failures = compare(results, json.load(f)["results"], args.tolerance)
+    for message in failures:
+        print(f"REGRESSION {message}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Startup budget for the computation package, measured with `python -X importtime`.
+
+    python -m benchmarks.startup           # check against benchmarks/startup.json
+    python -m benchmarks.startup --update  # record new budgets
+
+Each target is imported in a fresh interpreter and its total import time is
+the sum of the "self" column of the importtime trace (best of --repeat runs).
+The "app" target is every mf_analytics module that MF_Comparison_Tool.py
+imports at the top, i.e. what a cold Streamlit session pays on top of
+streamlit itself. No target may load a module in HEAVY: those are imported
+only when their feature is used.
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "MF_Comparison_Tool.py")
+BUDGET_PATH = os.path.join(os.path.dirname(__file__), "startup.json")
+TOLERANCE = 1.5
+HEAVY = ("matplotlib", "fpdf", "plotly", "xlsxwriter")
+
+
+def app_imports(path=APP_PATH):
+    """mf_analytics modules imported at the top level of the Streamlit app."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("mf_analytics"):
+            modules.append(node.module)
+        elif isinstance(node, ast.Import):
+            modules.extend(a.name for a in node.names if a.name.startswith("mf_analytics"))
+    return sorted(set(modules))
+
+
+def targets():
+    return {
+        "mf_analytics": ["mf_analytics"],
+        "mf_analytics.metrics": ["mf_analytics.metrics"],
+        "mf_analytics.report": ["mf_analytics.report"],
+        "app": app_imports(),
+    }
+
+
+def import_trace(modules):
+    """(total ms, names of all imported modules) for importing `modules` in a new interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        total_us += int(self_us)
+        loaded.add(name.strip())
+    return total_us / 1000, loaded
+
+
+def measure(repeat):
+    results, violations = {}, []
+    for name, modules in targets().items():
+        best = float("inf")
+        for _ in range(repeat):
+            ms, loaded = import_trace(modules)
+            best = min(best, ms)
+        heavy = sorted(m for m in loaded if m.split(".")[0] in HEAVY and "." not in m)
+        if heavy:
+            violations.append(f"{name} imports {', '.join(heavy)} at startup")
+        results[name] = best
+        print(f"{name:<24} {best:>9.1f} ms", flush=True)
+    return results, violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check import-time startup budgets.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", default=BUDGET_PATH)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--update", action="store_true", help="record the measured times as the budget")
+    args = parser.parse_args(argv)
+
+    results, failures = measure(args.repeat)
+    if args.update:
+        with open(args.budget, "w") as f:
+            json.dump({"import_ms": results}, f, indent=2, sort_keys=True)
+        print(f"Startup budget written to {args.budget}")
+    elif os.path.exists(args.budget):
+        with open(args.budget) as f:
+            budget = json.load(f)["import_ms"]
+        for name, ms in results.items():
+            if name in budget and ms > budget[name] * args.tolerance:
+                failures.append(f"{name}: {ms:.1f} ms > {budget[name] * args.tolerance:.1f} ms "
+                                f"(budget {budget[name]:.1f} ms)")
+    for message in failures:
+        print(f"OVER BUDGET {message}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
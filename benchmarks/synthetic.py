@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# Last NAV date of every synthetic history
+END_DATE = pd.Timestamp("2025-06-13")
+
+
+def business_days(end, periods):
+    """The `periods` weekdays up to `end` (numpy busday, much faster than bdate_range)."""
+    end = np.datetime64(pd.Timestamp(end), "D")
+    days = np.arange(end - periods * 7 // 5 - 7, end + 1, dtype="datetime64[D]")
+    return pd.DatetimeIndex(days[np.is_busday(days)][-periods:])
+
+
+def synthetic_nav(years, seed=None, end=END_DATE, annual_return=0.12, annual_vol=0.18,
+                  holiday_rate=0.03, gap_rate=0.002, max_gap=10):
+    """
+    A realistic-looking NAV history (columns date, nav) of about `years` years.
+
+    Prices follow a geometric random walk over business days. About
+    `holiday_rate` of days are dropped as market holidays, and multi-day gaps
+    (missing data) start on about `gap_rate` of days.
+    """
+    rng = np.random.default_rng(seed)
+    days = business_days(end, max(int(years * 252), 2))
+    keep = rng.random(len(days)) >= holiday_rate
+    for start in np.flatnonzero(rng.random(len(days)) < gap_rate):
+        keep[start:start + rng.integers(2, max_gap + 1)] = False
+    keep[[0, -1]] = True
+    days = days[keep]
+
+    dt = 1 / 252
+    drift = (annual_return - annual_vol ** 2 / 2) * dt
+    shocks = rng.normal(drift, annual_vol * np.sqrt(dt), len(days))
+    nav = rng.uniform(10, 100) * np.exp(np.cumsum(shocks))
+    return pd.DataFrame({"date": days, "nav": nav})
+
+
+def synthetic_universe(n_funds, min_years=1, max_years=30, seed=0):
+    """{scheme_code: nav_df} for `n_funds` funds with random ages, returns and volatility."""
+    rng = np.random.default_rng(seed)
+    seeds = np.random.SeedSequence(seed).spawn(n_funds)
+    return {
+        100000 + i: synthetic_nav(
+            rng.uniform(min_years, max_years),
+            seed=s,
+            annual_return=rng.uniform(0.04, 0.18),
+            annual_vol=rng.uniform(0.02, 0.30),
+        )
+        for i, s in enumerate(seeds)
+    }
@@ -0,0 +1,48 @@
+"""
+Computation helpers for the Mutual Fund Comparison Tool.
+
+The main loaders and metrics are importable straight from the package, e.g.
+``from mf_analytics import NavStore, scheme_metrics``. Submodules are only
+imported when one of their names is first used, so importing the package
+(or a single submodule) never pulls in matplotlib, fpdf or plotly.
+"""
+import importlib
+
+_EXPORTS = {
+    "load_scheme_master": "amfi",
+    "NavStore": "store",
+    "fetch_nav_history": "mfapi",
+    "SchemeIndex": "search",
+    "compute_cagr": "metrics",
+    "compute_rolling_cagr": "metrics",
+    "compute_sip_xirr": "metrics",
+    "scheme_metrics": "metrics",
+    "rolling_cagr": "rolling",
+    "rolling_summary": "rolling",
+    "simulate_sip": "sip",
+    "rolling_sip_xirr": "sip",
+    "xirr_batch": "xirr",
+    "align_navs": "panel",
+    "NavPanel": "panel",
+    "risk_metrics": "risk",
+    "correlation_matrix": "correlation",
+    "cluster_funds": "correlation",
+    "backtest": "portfolio",
+    "project_funds": "montecarlo",
+    "build_report": "report",
+    "build_workbook": "export",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,103 @@
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from mf_analytics.http import SESSION
+from mf_analytics.store import DATA_DIR, OFFLINE
+
+NAVALL_URL = "https://www.amfiindia.com/spages/NAVAll.txt"
+MASTER_PATH = os.path.join(DATA_DIR, "scheme_master.parquet")
+# NAVAll.txt is republished once a day
+MAX_AGE = 12 * 3600
+
+# e.g. "Open Ended Schemes(Equity Scheme - Large Cap Fund)"
+_CATEGORY_LINE = re.compile(r"^(?P<type>[^()]*Schemes?)\s*\((?P<category>.*)\)\s*$")
+
+COLUMNS = ["SchemeCode", "SchemeName", "AMC", "SchemeType", "Category",
+           "ISINGrowth", "ISINReinvest", "NAV", "Date"]
+
+
+def _isin(value):
+    value = value.strip()
+    return value if value and value != "-" else None
+
+
+def parse_navall(lines):
+    """
+    Yield one tuple per scheme (see COLUMNS, NAV and Date still as text) from
+    the lines of NAVAll.txt. Category headers and AMC names are section lines
+    without ';' and apply to the schemes that follow them.
+    """
+    scheme_type = category = amc = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if ";" not in line:
+            match = _CATEGORY_LINE.match(line)
+            if match:
+                scheme_type, category = match["type"].strip(), match["category"].strip()
+            else:
+                amc = line
+            continue
+        parts = line.split(";")
+        if len(parts) < 5 or not parts[0].strip().isdigit():
+            continue  # column header
+        yield (
+            int(parts[0]), parts[3].strip(), amc, scheme_type, category,
+            _isin(parts[1]), _isin(parts[2]), parts[4].strip(),
+            parts[5].strip() if len(parts) > 5 else "",
+        )
+
+
+def build_scheme_master(lines):
+    """Compact, typed scheme master table from NAVAll.txt lines."""
+    records = list(parse_navall(lines))
+    df = pd.DataFrame.from_records(records, columns=COLUMNS)
+    df["SchemeCode"] = df["SchemeCode"].astype(np.int32)
+    for col in ("AMC", "SchemeType", "Category"):
+        df[col] = df[col].astype("category")
+    df["NAV"] = pd.to_numeric(df["NAV"], errors="coerce").astype(np.float32)
+    df["Date"] = pd.to_datetime(df["Date"], format="%d-%b-%Y", errors="coerce")
+    return df
+
+
+def fetch_scheme_master():
+    """Stream NAVAll.txt line by line into the scheme master table."""
+    with SESSION.get(NAVALL_URL, stream=True, timeout=60) as r:
+        r.raise_for_status()
+        r.encoding = r.encoding or "utf-8"
+        return build_scheme_master(r.iter_lines(decode_unicode=True))
+
+
+def load_scheme_master(path=MASTER_PATH, max_age=MAX_AGE, offline=OFFLINE):
+    """
+    Scheme master from disk if it is younger than `max_age` seconds (or
+    `offline` is set), otherwise refreshed from AMFI and saved. A stale file
+    is still used when AMFI cannot be reached.
+    """
+    exists = os.path.exists(path)
+    if exists and (offline or time.time() - os.path.getmtime(path) < max_age):
+        return pd.read_parquet(path)
+    try:
+        df = fetch_scheme_master()
+    except requests.RequestException:
+        if exists:
+            return pd.read_parquet(path)
+        raise
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df.to_parquet(path, index=False)
+    return df
+
+
+def latest_nav(master, scheme_code):
+    """(NAV, date, category) of a scheme from the master table, None if unknown."""
+    row = master.loc[master["SchemeCode"] == int(scheme_code)]
+    if row.empty:
+        return None
+    row = row.iloc[0]
+    return float(row["NAV"]), row["Date"], row["Category"]
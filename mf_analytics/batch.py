@@ -0,0 +1,128 @@
+"""
+Headless universe-wide metrics job.
+
+    python -m mf_analytics.batch --workers 8 --chunk-size 200
+
+Schemes are split into chunks that run on a process pool. Every finished
+chunk is written to its own Parquet file, so an interrupted run resumes
+where it stopped when restarted on the same day. The chunks are then merged
+into a leaderboard file and per-category percentile tables that the
+Streamlit app loads directly, and the chunk files are deleted. --fresh
+discards the chunks of an interrupted run instead of resuming it.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+from datetime import date
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from mf_analytics.amfi import load_scheme_master
+from mf_analytics.metrics import MIN_HISTORY, scheme_metrics
+from mf_analytics.panel import build_panel
+from mf_analytics.peers import build_peer_quantiles, save_peer_quantiles
+from mf_analytics.store import DATA_DIR, NavStore
+
+LEADERBOARD_PATH = os.path.join(DATA_DIR, "leaderboard.parquet")
+CHUNK_DIR = os.path.join(DATA_DIR, "leaderboard_chunks")
+
+
+def chunk_path(chunk_dir, codes, sip_amount, run_date):
+    """
+    Chunk file named after its contents and the run date, so changed chunks
+    and chunks left over from an earlier day are recomputed.
+    """
+    key = ",".join(map(str, codes)) + f"|{sip_amount}|{run_date}"
+    return os.path.join(chunk_dir, f"chunk_{hashlib.sha1(key.encode()).hexdigest()[:16]}.parquet")
+
+
+def run_chunk(job):
+    codes, path, sip_amount, offline = job
+    frames = {}
+    for code, (nav_df, _) in NavStore().history_many(codes, offline=offline):
+        if nav_df is not None and len(nav_df) >= MIN_HISTORY:
+            frames[code] = nav_df
+    if frames:
+        result = scheme_metrics(frames, sip_amount=sip_amount).rename(columns={"key": "SchemeCode"})
+    else:
+        result = pd.DataFrame({"SchemeCode": pd.Series(dtype=np.int32)})
+    # Write then rename, so an interrupted run never leaves a partial chunk behind
+    tmp = f"{path}.tmp"
+    result.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return len(codes), len(frames)
+
+
+def build_leaderboard(master, chunk_files, out_path=LEADERBOARD_PATH):
+    parts = [pd.read_parquet(p) for p in chunk_files]
+    metrics = pd.concat([p for p in parts if len(p)], ignore_index=True) if parts else pd.DataFrame()
+    if metrics.empty:
+        metrics = pd.DataFrame({"SchemeCode": pd.Series(dtype=np.int32)})
+    info = master[["SchemeCode", "SchemeName", "AMC", "Category"]]
+    board = info.merge(metrics, on="SchemeCode", how="inner")
+    if "Rolling5Y" in board:
+        board = board.sort_values("Rolling5Y", ascending=False, na_position="last")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    board.to_parquet(out_path, index=False)
+    return board
+
+
+def load_leaderboard(path=LEADERBOARD_PATH):
+    """Leaderboard written by the batch job, or None if it has not been run."""
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute metrics for every scheme in the AMFI list.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--sip-amount", type=float, default=5000)
+    parser.add_argument("--category", help="only schemes whose category contains this text")
+    parser.add_argument("--limit", type=int, help="only the first N schemes (for trial runs)")
+    parser.add_argument("--offline", action="store_true", help="use stored NAV data only")
+    parser.add_argument("--out", default=LEADERBOARD_PATH)
+    parser.add_argument("--panel", action="store_true", help="also rebuild the shared NAV panel")
+    parser.add_argument("--fresh", action="store_true", help="discard chunks of an interrupted run")
+    args = parser.parse_args(argv)
+
+    master = load_scheme_master(offline=args.offline)
+    if args.category:
+        master = master[master["Category"].astype(str).str.contains(args.category, case=False, regex=False)]
+    codes = np.unique(master["SchemeCode"].to_numpy())[:args.limit]
+
+    if args.fresh:
+        shutil.rmtree(CHUNK_DIR, ignore_errors=True)
+    os.makedirs(CHUNK_DIR, exist_ok=True)
+    run_date = date.today().isoformat()
+    chunks = [codes[i:i + args.chunk_size].tolist() for i in range(0, len(codes), args.chunk_size)]
+    paths = [chunk_path(CHUNK_DIR, chunk, args.sip_amount, run_date) for chunk in chunks]
+    jobs = [
+        (chunk, path, args.sip_amount, args.offline)
+        for chunk, path in zip(chunks, paths) if not os.path.exists(path)
+    ]
+    print(f"{len(codes)} schemes in {len(chunks)} chunks, {len(chunks) - len(jobs)} already done")
+
+    with Pool(processes=args.workers) as pool:
+        for done, (n_codes, n_ranked) in enumerate(pool.imap_unordered(run_chunk, jobs), start=1):
+            print(f"[{done}/{len(jobs)}] {n_ranked} of {n_codes} schemes ranked")
+
+    board = build_leaderboard(master, paths, args.out)
+    print(f"Leaderboard with {len(board)} schemes written to {args.out}")
+    # Resuming is only for interrupted runs; the next run must recompute every chunk
+    shutil.rmtree(CHUNK_DIR, ignore_errors=True)
+
+    # Category percentiles only make sense over the full universe
+    if not (args.category or args.limit):
+        quantiles = build_peer_quantiles(board)
+        save_peer_quantiles(quantiles)
+        print(f"Peer quantile tables for {quantiles['Category'].nunique()} categories saved")
+
+    if args.panel:
+        print(f"NAV panel written to {build_panel(NavStore(), board['SchemeCode'].tolist())}")
+
+
+if __name__ == "__main__":
+    main()
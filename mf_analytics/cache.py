@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import pandas as pd
+
+from mf_analytics.metrics import compute_cagr, compute_sip_xirr
+from mf_analytics.rolling import HORIZONS, rolling_cagr
+from mf_analytics.sip import rolling_sip_xirr
+from mf_analytics.store import DATA_DIR, connect
+
+# Total size of cached entries before the least recently used ones are dropped
+MAX_BYTES = int(os.environ.get("MF_METRICS_CACHE_MB", "256")) * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_accessed ON metrics (accessed_at);
+"""
+
+
+def cache_key(scheme_code, last_nav_date, params):
+    """Key for one scheme's results; a new NAV or different parameters give a new key."""
+    raw = json.dumps(
+        [int(scheme_code), pd.Timestamp(last_nav_date).strftime("%Y-%m-%d"), params],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class MetricsCache:
+    """
+    Computed per-scheme metrics (including rolling series) in SQLite, shared
+    by every session and process, with size-bounded LRU eviction.
+    """
+
+    def __init__(self, path=None, max_bytes=MAX_BYTES):
+        self.path = path or os.path.join(DATA_DIR, "metrics_cache.sqlite")
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def get(self, scheme_code, last_nav_date, params):
+        key = cache_key(scheme_code, last_nav_date, params)
+        with connect(self.path) as conn:
+            row = conn.execute("SELECT value FROM metrics WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE metrics SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, scheme_code, last_nav_date, params, value):
+        key = cache_key(scheme_code, last_nav_date, params)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with connect(self.path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            # Keep the most recently used entries that fit in max_bytes
+            conn.execute(
+                "DELETE FROM metrics WHERE key IN ("
+                " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS total FROM metrics)"
+                " WHERE total > ?)",
+                (self.max_bytes,),
+            )
+
+    def clear(self):
+        with connect(self.path) as conn:
+            conn.execute("DELETE FROM metrics")
+
+
+def cached_fund_metrics(cache, nav_frames, scheme_codes, sip_amount=5000, sip_frequency="monthly",
+                        sip_step_up=0.0, horizons=HORIZONS):
+    """
+    CAGR, rolling CAGR frame, SIP XIRR and SIP ledger per fund in `nav_frames`
+    ({name: nav_df}; `scheme_codes` maps name to code). Only funds missing
+    from `cache` are computed, with their rolling returns in one batch.
+    """
+    params = {
+        "sip_amount": sip_amount,
+        "sip_frequency": sip_frequency,
+        "sip_step_up": sip_step_up,
+        "horizons": list(horizons),
+    }
+    results = {}
+    for fund, nav_df in nav_frames.items():
+        hit = cache.get(scheme_codes[fund], nav_df["date"].iloc[-1], params)
+        if hit is not None:
+            results[fund] = hit
+
+    missing = {fund: df for fund, df in nav_frames.items() if fund not in results}
+    rolling = rolling_cagr(missing, horizons)
+    for fund, nav_df in missing.items():
+        sip_xirr, sip = compute_sip_xirr(
+            nav_df, sip_amount, frequency=sip_frequency, step_up=sip_step_up
+        )
+        results[fund] = {
+            "cagr": compute_cagr(nav_df),
+            "rolling": rolling[fund],
+            "sip_xirr": sip_xirr,
+            "sip_ledger": sip.ledger,
+        }
+        cache.put(scheme_codes[fund], nav_df["date"].iloc[-1], params, results[fund])
+    return {fund: results[fund] for fund in nav_frames}
+
+
+def cached_rolling_sip(cache, nav_frames, scheme_codes, years=5):
+    """`rolling_sip_xirr` per fund, through the same cache as `cached_fund_metrics`."""
+    params = {"metric": "rolling_sip_xirr", "years": years}
+    results = {}
+    for fund, nav_df in nav_frames.items():
+        last_date = nav_df["date"].iloc[-1]
+        results[fund] = cache.get(scheme_codes[fund], last_date, params)
+        if results[fund] is None:
+            results[fund] = rolling_sip_xirr(nav_df, years)
+            cache.put(scheme_codes[fund], last_date, params, results[fund])
+    return results
+
+
+def cached_peer_sip_xirr(cache, nav_frames, scheme_codes, years=5):
+    """
+    Flat monthly SIP XIRR (%) per fund, as the batch job ranks peers by,
+    through the same cache as `cached_fund_metrics`.
+    """
+    params = {"metric": "peer_sip_xirr", "years": years}
+    results = {}
+    for fund, nav_df in nav_frames.items():
+        last_date = nav_df["date"].iloc[-1]
+        results[fund] = cache.get(scheme_codes[fund], last_date, params)
+        if results[fund] is None:
+            results[fund] = compute_sip_xirr(nav_df, years=years)[0]
+            cache.put(scheme_codes[fund], last_date, params, results[fund])
+    return results
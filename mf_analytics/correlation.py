@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+# Weekly returns are taken from the last NAV of each week ending Friday
+RETURN_FREQUENCIES = {"daily": None, "weekly": "W-FRI"}
+# Funds correlated at least this much are reported as redundant picks
+REDUNDANT_CORRELATION = 0.9
+
+
+def period_returns(dates, matrix, frequency="daily"):
+    """(dates, returns) of a date-by-fund NAV matrix at the given frequency."""
+    if frequency not in RETURN_FREQUENCIES:
+        raise ValueError(f"Unknown return frequency: {frequency}")
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if RETURN_FREQUENCIES[frequency] is not None:
+        # Last row of every week (rows are sorted, so each week's last position wins)
+        weeks = pd.DatetimeIndex(dates).to_period(RETURN_FREQUENCIES[frequency]).asi8
+        last = np.flatnonzero(np.append(weeks[1:] != weeks[:-1], True))
+        dates, matrix = pd.DatetimeIndex(dates)[last], matrix[last]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DatetimeIndex(dates)[1:], matrix[1:] / matrix[:-1] - 1
+
+
+def correlation(returns, min_periods=20):
+    """
+    Pairwise-complete Pearson correlation of the columns of `returns`, where
+    every pair only uses the periods both funds have a return for.
+
+    All pairwise sums come out of a few matrix products over the zero-filled
+    returns and their validity mask, so the cost is a handful of BLAS calls
+    however many funds there are. Pairs with fewer than `min_periods` common
+    periods are NaN.
+    """
+    valid = ~np.isnan(returns)
+    x = np.where(valid, returns, 0.0)
+    m = valid.astype(np.float64)
+    n = m.T @ m                 # common periods per pair
+    sx = x.T @ m                # sum of fund i over periods shared with fund j
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = n * sxy - sx * sx.T
+        var = n * sxx - sx * sx
+        corr = cov / np.sqrt(var * var.T)
+    corr[n < min_periods] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    np.fill_diagonal(corr, np.where(np.diag(n) >= min_periods, 1.0, np.nan))
+    return corr
+
+
+def correlation_matrix(dates, names, matrix, frequency="daily", min_periods=20):
+    """Correlation DataFrame of the funds' returns at `frequency`."""
+    _, returns = period_returns(dates, matrix, frequency)
+    return pd.DataFrame(correlation(returns, min_periods), index=names, columns=names)
+
+
+def rolling_correlation(dates, returns, names, window, pairs=None):
+    """
+    Rolling correlation over `window` periods for each pair of columns (all
+    pairs by default), as one column per pair named "A / B". Windows with a
+    missing return in either fund are NaN.
+    """
+    n_cols = returns.shape[1]
+    if pairs is None:
+        pairs = [(i, j) for i in range(n_cols) for j in range(i + 1, n_cols)]
+    if not pairs:
+        return pd.DataFrame(index=pd.DatetimeIndex(dates))
+    i, j = np.array(pairs).T
+    a, b = returns[:, i], returns[:, j]
+    both = ~(np.isnan(a) | np.isnan(b))
+    a, b = np.where(both, a, 0.0), np.where(both, b, 0.0)
+
+    def window_sum(values):
+        c = np.cumsum(np.vstack([np.zeros((1, values.shape[1])), values]), axis=0)
+        return c[window:] - c[:-window]
+
+    n = window_sum(both.astype(np.float64))
+    sa, sb = window_sum(a), window_sum(b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = n * window_sum(a * b) - sa * sb
+        var_a = n * window_sum(a * a) - sa * sa
+        var_b = n * window_sum(b * b) - sb * sb
+        corr = cov / np.sqrt(var_a * var_b)
+    corr[n < window] = np.nan
+    labels = [f"{names[p]} / {names[q]}" for p, q in pairs]
+    return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=pd.DatetimeIndex(dates)[window - 1:], columns=labels)
+
+
+def average_linkage(distance):
+    """
+    Agglomerative clustering of a square distance matrix with average linkage.
+
+    Returns a linkage matrix in SciPy's layout, one row (left, right, height,
+    size) per merge, where ids below n are the original items and n + k is
+    the cluster formed by merge k.
+    """
+    n = len(distance)
+    d = np.array(distance, dtype=np.float64)
+    d[np.isnan(d)] = np.nanmax(d) if np.isfinite(d).any() else 1.0
+    np.fill_diagonal(d, np.inf)
+    size = np.ones(n)
+    ids = np.arange(n)
+    linkage = np.zeros((max(n - 1, 0), 4))
+    for k in range(n - 1):
+        flat = int(np.argmin(d))
+        p, q = divmod(flat, n)
+        if p > q:
+            p, q = q, p
+        linkage[k] = ids[p], ids[q], d[p, q], size[p] + size[q]
+        # Lance-Williams update: the merged cluster keeps slot p, slot q is retired
+        merged = (size[p] * d[p] + size[q] * d[q]) / (size[p] + size[q])
+        d[p, :], d[:, p] = merged, merged
+        d[p, p] = np.inf
+        d[q, :], d[:, q] = np.inf, np.inf
+        size[p] += size[q]
+        ids[p] = n + k
+    return linkage
+
+
+def leaf_order(linkage, n):
+    """Items in dendrogram order, which puts similar funds next to each other."""
+    children = {n + k: (int(row[0]), int(row[1])) for k, row in enumerate(linkage)}
+    if not children:
+        return list(range(n))
+    order, stack = [], [n + len(linkage) - 1]
+    while stack:
+        node = stack.pop()
+        if node < n:
+            order.append(node)
+        else:
+            left, right = children[node]
+            stack += [right, left]
+    return order
+
+
+def flat_clusters(linkage, n, max_distance):
+    """Cluster label per item after cutting the tree at `max_distance`."""
+    parent = np.arange(n + len(linkage))
+    for k, (left, right, height, _) in enumerate(linkage):
+        if height <= max_distance:
+            parent[int(left)] = parent[int(right)] = n + k
+
+    def root(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    roots = [root(i) for i in range(n)]
+    _, labels = np.unique(roots, return_inverse=True)
+    return labels
+
+
+def cluster_funds(corr, threshold=REDUNDANT_CORRELATION):
+    """
+    Hierarchical clustering of a correlation DataFrame on the distance
+    1 - correlation. Returns (dendrogram order of fund names, list of fund
+    groups whose members are on average correlated at least `threshold`).
+    """
+    names = list(corr.index)
+    linkage = average_linkage(1 - corr.to_numpy(dtype=np.float64))
+    order = [names[i] for i in leaf_order(linkage, len(names))]
+    labels = flat_clusters(linkage, len(names), 1 - threshold)
+    groups = [[names[i] for i in np.flatnonzero(labels == g)] for g in np.unique(labels)]
+    return order, [g for g in groups if len(g) > 1]
@@ -0,0 +1,73 @@
+import numpy as np
+
+# Points per trace and method for each chart; callers may override per chart
+CHART_DEFAULTS = {
+    "rolling_cagr": {"max_points": 1500, "method": "lttb"},
+    "pdf_rolling_cagr": {"max_points": 800, "method": "lttb"},
+}
+
+
+def lttb(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.append(edges, n)  # the last "next bucket" is the final point
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_x = x[hi:edges[i + 2]].mean()
+        nxt_y = y[hi:edges[i + 2]].mean()
+        # Twice the triangle area between the last kept point, each candidate and the next bucket's mean
+        area = np.abs((x[a] - nxt_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (nxt_y - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def minmax(y, n_out):
+    """Indices of the min and max of each of n_out / 2 equal buckets, plus both ends."""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    n_buckets = n_out // 2
+    bucket = np.arange(n) * n_buckets // n
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate([order[starts], order[ends], [0, n - 1]]))
+
+
+def downsample_series(series, max_points=1500, method="lttb", start=None, end=None):
+    """
+    Reduce a date-indexed series to about `max_points` while keeping its shape.
+    Only the visible [start, end] range is kept first, so zooming in returns
+    more detail for the same point budget.
+    """
+    series = series.dropna()
+    if start is not None or end is not None:
+        series = series.loc[start:end]
+    if len(series) <= max_points:
+        return series
+    if method == "minmax":
+        keep = minmax(series.to_numpy(dtype=np.float64), max_points)
+    elif method == "lttb":
+        x = series.index.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        keep = lttb(x - x[0], series.to_numpy(dtype=np.float64), max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return series.iloc[keep]
+
+
+def downsample_dict(series_by_name, max_points=1500, method="lttb", start=None, end=None):
+    """`downsample_series` applied to every series of a chart."""
+    return {
+        name: downsample_series(s, max_points, method, start, end)
+        for name, s in series_by_name.items()
+    }
@@ -0,0 +1,189 @@
+"""
+Excel export of NAV histories, rolling returns and SIP ledgers.
+
+    python -m mf_analytics.export --out universe.xlsx --category "Large Cap"
+
+Workbooks are written with xlsxwriter's constant_memory mode: every row is
+flushed to disk as soon as the next one starts, so memory stays flat however
+many funds and years are exported. Funds are consumed one at a time from an
+iterable, which lets the universe-wide export load each NAV history from the
+store only when its sheet is written.
+"""
+import argparse
+import hashlib
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from mf_analytics.rolling import rolling_cagr
+from mf_analytics.sip import simulate_sip
+from mf_analytics.store import NavStore
+
+# Excel stores dates as days since 1899-12-30
+_EXCEL_EPOCH = np.datetime64("1899-12-30", "D")
+_SHEET_INVALID = re.compile(r"[\[\]:*?/\\]")
+LEDGER_COLUMNS = {
+    "date": "Instalment Date",
+    "nav_date": "NAV Date",
+    "nav": "Buy NAV",
+    "amount": "Amount",
+    "units": "Units",
+    "cum_units": "Total Units",
+    "invested": "Invested",
+    "value": "Value",
+}
+
+
+def sheet_name(name, used):
+    """Valid, unique (case-insensitively) Excel sheet name of at most 31 characters."""
+    base = _SHEET_INVALID.sub("_", str(name)).strip("'")[:31] or "Sheet"
+    candidate, n = base, 1
+    while candidate.lower() in used:
+        n += 1
+        suffix = f" ({n})"
+        candidate = base[:31 - len(suffix)] + suffix
+    used.add(candidate.lower())
+    return candidate
+
+
+def _column(header, values):
+    """(header, python values, kind, valid mask) for one worksheet column."""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        days = values.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+        serial = (days - _EXCEL_EPOCH).astype(np.float64)
+        return header, serial.tolist(), "date", (~pd.isna(values)).tolist()
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numbers = values.to_numpy(dtype=np.float64)
+        return header, numbers.tolist(), "number", np.isfinite(numbers).tolist()
+    return header, values.astype(str).tolist(), "text", values.notna().tolist()
+
+
+def _write_columns(ws, columns, formats):
+    """
+    Write columns of possibly different lengths side by side, strictly row by
+    row as constant_memory requires. A None entry leaves an empty column.
+    """
+    for col, spec in enumerate(columns):
+        if spec is not None:
+            ws.write_string(0, col, spec[0], formats["header"])
+    n_rows = max((len(spec[1]) for spec in columns if spec is not None), default=0)
+    for i in range(n_rows):
+        for col, spec in enumerate(columns):
+            if spec is None:
+                continue
+            _, values, kind, valid = spec
+            if i >= len(values) or not valid[i]:
+                continue
+            if kind == "text":
+                ws.write_string(i + 1, col, values[i])
+            else:
+                ws.write_number(i + 1, col, values[i], formats[kind])
+
+
+def fund_columns(nav_df, rolling=None, sip_ledger=None):
+    """Column specs of one fund's sheet: NAV history, rolling CAGR (%), then the SIP ledger."""
+    columns = [_column("Date", nav_df["date"]), _column("NAV", nav_df["nav"])]
+    if rolling is not None:
+        columns += [_column(f"Rolling {label} CAGR (%)", rolling[label]) for label in rolling.columns]
+    if sip_ledger is not None and len(sip_ledger):
+        columns.append(None)
+        columns += [_column(title, sip_ledger[key]) for key, title in LEDGER_COLUMNS.items() if key in sip_ledger]
+    return columns
+
+
+def write_workbook(path, summary, funds, tmpdir=None):
+    """
+    Write `summary` (a DataFrame) to a "Summary" sheet and one sheet per item
+    of `funds`, an iterable of (name, nav_df, rolling_df or None, sip_ledger
+    or None). Returns the number of fund sheets written.
+    """
+    import xlsxwriter
+
+    options = {"constant_memory": True}
+    if tmpdir:
+        options["tmpdir"] = tmpdir
+    workbook = xlsxwriter.Workbook(path, options)
+    try:
+        formats = {
+            "header": workbook.add_format({"bold": True}),
+            "date": workbook.add_format({"num_format": "dd-mmm-yyyy"}),
+            "number": workbook.add_format({"num_format": "0.00##"}),
+        }
+        used = set()
+        ws = workbook.add_worksheet(sheet_name("Summary", used))
+        _write_columns(ws, [_column(str(c), summary[c]) for c in summary.columns], formats)
+        ws.freeze_panes(1, 0)
+
+        count = 0
+        for name, nav_df, rolling, sip_ledger in funds:
+            ws = workbook.add_worksheet(sheet_name(name, used))
+            _write_columns(ws, fund_columns(nav_df, rolling, sip_ledger), formats)
+            ws.set_column(0, 0, 12)
+            ws.freeze_panes(1, 1)
+            count += 1
+    finally:
+        workbook.close()
+    return count
+
+
+def build_workbook(summary, funds):
+    """The workbook as bytes, written through a temporary file to keep memory flat."""
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        write_workbook(path, summary, funds)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+def export_key(summary, nav_frames, rolling, sip_ledgers):
+    """Hash of everything that ends up in the workbook."""
+    h = hashlib.sha1(pd.util.hash_pandas_object(summary, index=True).to_numpy().tobytes())
+    for group in (nav_frames, rolling, sip_ledgers):
+        for fund, data in group.items():
+            h.update(str(fund).encode())
+            h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def store_funds(store, schemes, sip_amount=5000):
+    """(name, nav_df, rolling, ledger) per scheme in `schemes` ({code: name}), read one at a time."""
+    for code, name in schemes.items():
+        nav_df = store.read(code)
+        if not len(nav_df):
+            continue
+        rolling = rolling_cagr({code: nav_df})[code]
+        yield f"{code} {name}", nav_df, rolling, simulate_sip(nav_df, amount=sip_amount).ledger
+
+
+def main(argv=None):
+    from mf_analytics.batch import load_leaderboard
+
+    parser = argparse.ArgumentParser(description="Export stored NAV histories and metrics to Excel.")
+    parser.add_argument("--out", default="mf_export.xlsx")
+    parser.add_argument("--sip-amount", type=float, default=5000)
+    parser.add_argument("--category", help="only schemes whose category contains this text")
+    parser.add_argument("--limit", type=int, help="only the first N schemes of the leaderboard")
+    args = parser.parse_args(argv)
+
+    board = load_leaderboard()
+    if board is None:
+        parser.error("no leaderboard found; run `python -m mf_analytics.batch` first")
+    if args.category:
+        board = board[board["Category"].astype(str).str.contains(args.category, case=False, regex=False)]
+    if args.limit:
+        board = board.head(args.limit)
+
+    schemes = dict(zip(board["SchemeCode"].astype(int), board["SchemeName"]))
+    count = write_workbook(args.out, board, store_funds(NavStore(), schemes, args.sip_amount))
+    print(f"Exported {count} schemes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import requests
+from urllib3.util.retry import Retry
+
+from mf_analytics.transport import transport_adapter
+
+# Upper bound on concurrent downloads (and pooled keep-alive connections per host)
+MAX_WORKERS = 8
+# (connect, read) seconds
+TIMEOUT = (5, 30)
+
+
+def make_session(max_workers=MAX_WORKERS, **transport):
+    """
+    Keep-alive session with retry and exponential backoff on transient errors.
+    Requests go through the transport configured by MF_HTTP_MODE and
+    MF_HTTP_UPSTREAM unless `transport` overrides it (see mf_analytics.transport).
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = transport_adapter(pool_connections=4, pool_maxsize=max_workers, max_retries=retry, **transport)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every fetcher; requests sessions are safe to use from a thread pool for GETs
+SESSION = make_session()
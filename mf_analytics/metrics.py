@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from mf_analytics.rolling import HORIZONS, horizon_label, rolling_cagr
+from mf_analytics.sip import simulate_sip
+from mf_analytics.xirr import xirr, xirr_ragged
+
+# Funds with fewer NAV rows than this are skipped (about 3 years of trading days)
+MIN_HISTORY = 800
+
+
+def compute_rolling_cagr(df, years=5):
+    rolling = rolling_cagr({"fund": df}, horizons=(years,))["fund"]
+    return rolling[horizon_label(years)].dropna()
+
+
+def compute_cagr(df):
+    start = df["nav"].iloc[0]
+    end = df["nav"].iloc[-1]
+    days = (df["date"].iloc[-1] - df["date"].iloc[0]).days
+    years = days / 365
+    return ((end / start) ** (1 / years) - 1) * 100
+
+
+def compute_sip_xirr(nav_df, sip_amount=5000, years=5, frequency="monthly", step_up=0.0):
+    """SIP XIRR (%) and the SipResult it was computed from."""
+    sip = simulate_sip(nav_df, amount=sip_amount, frequency=frequency, step_up=step_up, years=years)
+    rate = xirr(sip.cashflows, sip.dates) if len(sip.ledger) else None
+    if rate is not None:
+        return rate * 100, sip
+    return np.nan, sip
+
+
+def scheme_metrics(nav_frames, sip_amount=5000, sip_years=5, horizons=HORIZONS):
+    """
+    One row of headline metrics per fund in `nav_frames` ({key: nav_df}).
+
+    Rolling returns for all funds share one `rolling_cagr` call and the SIP
+    XIRRs are solved as one ragged batch.
+    """
+    keys = list(nav_frames)
+    rolling = rolling_cagr(nav_frames, horizons)
+    sips = [simulate_sip(nav_frames[k], amount=sip_amount, years=sip_years) for k in keys]
+    solvable = [i for i, sip in enumerate(sips) if len(sip.ledger)]
+    sip_xirr = np.full(len(keys), np.nan)
+    if solvable:
+        sip_xirr[solvable] = xirr_ragged([(sips[i].cashflows, sips[i].dates) for i in solvable]) * 100
+
+    rows = []
+    for i, key in enumerate(keys):
+        df = nav_frames[key]
+        row = {
+            "key": key,
+            "NAV": df["nav"].iloc[-1],
+            "NAVDate": df["date"].iloc[-1],
+            "Years": (df["date"].iloc[-1] - df["date"].iloc[0]).days / 365,
+            "CAGR": compute_cagr(df),
+        }
+        means = rolling[key].mean()
+        for label in rolling[key].columns:
+            row[f"Rolling{label}"] = means[label]
+        row[f"SIPXIRR{sip_years}Y"] = sip_xirr[i]
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from mf_analytics.http import SESSION, TIMEOUT
+
+MFAPI_URL = "https://api.mfapi.in/mf/"
+
+
+def parse_nav_json(data):
+    """Turn an api.mfapi.in response into (nav_df, category); (None, None) if it has no data."""
+    if not data or "data" not in data:
+        return None, None
+    df = pd.DataFrame(data["data"], columns=["date", "nav"])
+    df["nav"] = pd.to_numeric(df["nav"], errors="coerce")
+    df["date"] = pd.to_datetime(df["date"], format="%d-%m-%Y")
+    df = df.dropna().sort_values("date").reset_index(drop=True)
+    category = data.get("meta", {}).get("scheme_category", None)
+    return df, category
+
+
+def fetch_nav_history(scheme_code, start_date=None):
+    """Download a scheme's NAV history, optionally only from `start_date` onwards."""
+    params = {}
+    if start_date is not None:
+        params["startDate"] = pd.Timestamp(start_date).strftime("%Y-%m-%d")
+    r = SESSION.get(f"{MFAPI_URL}{scheme_code}", params=params, timeout=TIMEOUT)
+    r.raise_for_status()
+    df, category = parse_nav_json(r.json())
+    if df is not None and start_date is not None:
+        df = df[df["date"] >= pd.Timestamp(start_date)]
+    return df, category
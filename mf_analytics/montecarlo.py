@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+PERCENTILES = (10, 50, 90)
+BLOCK_MONTHS = 12
+
+
+def monthly_returns(nav_df):
+    """Month-end to month-end NAV returns."""
+    month_end = nav_df.set_index("date")["nav"].resample("ME").last().dropna()
+    return month_end.pct_change().dropna().to_numpy()
+
+
+def bootstrap_paths(returns, months, paths=10000, block=BLOCK_MONTHS, seed=None):
+    """
+    (paths, months) matrix of monthly returns built from random contiguous
+    blocks of history, which keeps short-term autocorrelation and volatility
+    clustering that i.i.d. resampling would lose. Raises ValueError when
+    there are no returns to sample from.
+    """
+    if len(returns) == 0:
+        raise ValueError("No monthly returns to bootstrap; the fund needs more than a month of NAV history")
+    rng = np.random.default_rng(seed)
+    block = min(block, len(returns))
+    n_blocks = -(-months // block)
+    starts = rng.integers(0, len(returns) - block + 1, size=(paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block)).reshape(paths, -1)[:, :months]
+    return returns[idx]
+
+
+def project(returns, years=10, amount=5000, mode="sip", paths=10000, block=BLOCK_MONTHS,
+            seed=None, percentiles=PERCENTILES):
+    """
+    Percentile corpus over time for a monthly SIP of `amount` or a lumpsum of
+    `amount`, from block-bootstrapped monthly returns. Returns a frame with
+    one row per month and one column per percentile, plus "Invested".
+    """
+    months = 12 * years
+    growth = np.cumprod(1 + bootstrap_paths(returns, months, paths, block, seed), axis=1)
+    if mode == "sip":
+        # Instalment k (paid before month k's return) is worth amount * G_t / G_{k-1} at month t
+        prev = np.concatenate([np.ones((paths, 1)), growth[:, :-1]], axis=1)
+        corpus = amount * growth * np.cumsum(1 / prev, axis=1)
+        invested = amount * np.arange(1, months + 1)
+    else:
+        corpus = amount * growth
+        invested = np.full(months, float(amount))
+
+    bands = np.percentile(corpus, percentiles, axis=0)
+    out = pd.DataFrame({f"P{p}": band for p, band in zip(percentiles, bands)})
+    out.insert(0, "Month", np.arange(1, months + 1))
+    out["Invested"] = invested
+    return out
+
+
+def _project_fund(args):
+    returns, kwargs = args
+    return project(returns, **kwargs)
+
+
+def project_funds(nav_frames, processes=None, seed=0, **kwargs):
+    """
+    `project` for every fund in `nav_frames`. Each fund gets its own stream
+    from one seeded generator, so results do not depend on `processes`; with
+    `processes` > 1 funds run on a process pool. Raises ValueError naming
+    a fund with under a month of history.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(nav_frames))
+    jobs = [
+        (monthly_returns(df), dict(kwargs, seed=s))
+        for df, s in zip(nav_frames.values(), seeds)
+    ]
+    for name, (returns, _) in zip(nav_frames, jobs):
+        if len(returns) == 0:
+            raise ValueError(f"No monthly returns to bootstrap for {name}; it needs more than a month of NAV history")
+    if processes and processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_project_fund, jobs))
+    else:
+        results = [_project_fund(job) for job in jobs]
+    return dict(zip(nav_frames, results))
@@ -0,0 +1,174 @@
+import argparse
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+
+from mf_analytics.store import DATA_DIR, NavStore
+
+PANEL_DIR = os.path.join(DATA_DIR, "panel")
+
+
+def forward_fill(matrix):
+    """Forward-fill NaNs down each column (leading NaNs stay NaN)."""
+    rows = np.arange(matrix.shape[0])[:, None]
+    last_valid = np.where(np.isnan(matrix), 0, rows)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    # Rows before a fund's first NAV point at row 0, which is NaN for that fund
+    return matrix[last_valid, np.arange(matrix.shape[1])]
+
+
+def align_navs(nav_frames, start=None, end=None, dtype=np.float64):
+    """
+    Date-by-fund NAV matrix over the union of all trading dates.
+
+    Returns (dates, names, matrix). Each column is forward-filled across days
+    its fund did not publish and NaN before the fund's first NAV.
+    """
+    names = list(nav_frames)
+    days = [nav_frames[n]["date"].to_numpy(dtype="datetime64[D]") for n in names]
+    calendar = np.unique(np.concatenate(days)) if days else np.array([], dtype="datetime64[D]")
+
+    matrix = np.full((len(calendar), len(names)), np.nan, dtype=dtype)
+    for j, (name, d) in enumerate(zip(names, days)):
+        matrix[np.searchsorted(calendar, d), j] = nav_frames[name]["nav"].to_numpy(dtype=dtype)
+    matrix = forward_fill(matrix)
+
+    # Cut the window after filling so the first row carries each fund's as-of NAV
+    lo = 0 if start is None else np.searchsorted(calendar, np.datetime64(pd.Timestamp(start), "D"))
+    hi = len(calendar) if end is None else np.searchsorted(calendar, np.datetime64(pd.Timestamp(end), "D"), side="right")
+    return pd.DatetimeIndex(calendar[lo:hi]), names, matrix[lo:hi]
+
+
+class NavPanel:
+    """
+    Read-only NAV panel for many schemes: a trading-day calendar, scheme codes,
+    each scheme's last published NAV date and a memory-mapped (dates x schemes)
+    NAV matrix plus a mask of forward-filled cells. Columns are stored contiguously (Fortran order), so
+    reading a few funds only pages in their columns, and every process that
+    opens the panel shares the same page-cache copy.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.calendar = pd.DatetimeIndex(np.load(os.path.join(path, "calendar.npy")))
+        self.codes = np.load(os.path.join(path, "codes.npy"))
+        self.nav = np.load(os.path.join(path, "nav.npy"), mmap_mode="r")
+        self.filled = np.load(os.path.join(path, "filled.npy"), mmap_mode="r")
+        self.column = {int(code): j for j, code in enumerate(self.codes)}
+        # Panels written before last_nav.npy existed cover nothing until rebuilt
+        last_nav = os.path.join(path, "last_nav.npy")
+        self.last_nav = np.load(last_nav) if os.path.exists(last_nav) else None
+
+    @classmethod
+    def open(cls, root=None):
+        """Latest panel written by `build_panel`, or None if there is none."""
+        root = root or PANEL_DIR
+        current = os.path.join(root, "CURRENT")
+        if not os.path.exists(current):
+            return None
+        with open(current) as f:
+            return cls(os.path.join(root, f.read().strip()))
+
+    def covers(self, last_dates):
+        """
+        Whether the panel holds every scheme in `last_dates` ({scheme code:
+        date of its latest known NAV, or None}) up to that date. Forward-filled cells do
+        not count, so a scheme whose NAVs arrived after the panel was built is
+        reported as not covered and should be read from the store.
+        """
+        if self.last_nav is None:
+            return False
+        for code, last_date in last_dates.items():
+            j = self.column.get(int(code))
+            if j is None or (last_date is not None and self.last_nav[j] < np.datetime64(pd.Timestamp(last_date), "D")):
+                return False
+        return True
+
+    def rows(self, start=None, end=None):
+        lo = 0 if start is None else self.calendar.searchsorted(pd.Timestamp(start))
+        hi = len(self.calendar) if end is None else self.calendar.searchsorted(pd.Timestamp(end), side="right")
+        return slice(lo, hi)
+
+    def select(self, scheme_codes=None, start=None, end=None):
+        """
+        (dates, matrix, filled) for the given schemes and date range. The
+        matrices are zero-copy views of the memory map only for the whole
+        universe or schemes in adjacent columns; any other `scheme_codes`
+        (what the app passes) copy just the chosen columns into memory.
+        """
+        rows = self.rows(start, end)
+        if scheme_codes is None:
+            return self.calendar[rows], self.nav[rows], self.filled[rows]
+        cols = [self.column[int(code)] for code in scheme_codes]
+        if cols and cols == list(range(cols[0], cols[0] + len(cols))):
+            cols = slice(cols[0], cols[0] + len(cols))
+        return self.calendar[rows], self.nav[rows, cols], self.filled[rows, cols]
+
+
+def build_panel(store, scheme_codes, root=None, dtype=np.float32, keep=2):
+    """
+    Write a new panel for `scheme_codes` from the NAV store and make it the
+    current one. Readers keep using the previous version until they reopen.
+
+    The calendar and last NAV dates come from SQL; histories are then read and
+    written one scheme at a time, so peak memory is one history plus a few
+    calendar-length columns, not the whole universe.
+    """
+    root = root or PANEL_DIR
+    last = store.last_dates(scheme_codes)
+    codes = np.array([c for c in dict.fromkeys(int(c) for c in scheme_codes) if c in last], dtype=np.int32)
+    last_nav = np.array([last[int(c)] for c in codes], dtype="datetime64[D]")
+    calendar = store.trading_days(codes)
+
+    version = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    path = os.path.join(root, version)
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "calendar.npy"), calendar)
+    np.save(os.path.join(path, "codes.npy"), codes)
+    np.save(os.path.join(path, "last_nav.npy"), last_nav)
+    shape = (len(calendar), len(codes))
+    nav = open_memmap(os.path.join(path, "nav.npy"), mode="w+", dtype=dtype, shape=shape, fortran_order=True)
+    filled = open_memmap(os.path.join(path, "filled.npy"), mode="w+", dtype=bool, shape=shape, fortran_order=True)
+
+    for j, code in enumerate(codes):
+        nav_df = store.read(code)
+        d = nav_df["date"].to_numpy(dtype="datetime64[D]")
+        # NAVs stored after the calendar was read are left for the next build
+        keep_rows = d <= last_nav[j]
+        column = np.full(len(calendar), np.nan)
+        published = np.zeros(len(calendar), dtype=bool)
+        pos = np.searchsorted(calendar, d[keep_rows])
+        column[pos] = nav_df["nav"].to_numpy(dtype=np.float64)[keep_rows]
+        published[pos] = True
+        nav[:, j] = forward_fill(column[:, None])[:, 0]
+        filled[:, j] = ~published & ~np.isnan(nav[:, j])
+    nav.flush()
+    filled.flush()
+    del nav, filled
+
+    tmp = os.path.join(root, "CURRENT.tmp")
+    with open(tmp, "w") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(root, "CURRENT"))
+
+    versions = sorted(v for v in os.listdir(root) if os.path.isdir(os.path.join(root, v)))
+    for old in versions[:-keep]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the shared memory-mapped NAV panel from the NAV store.")
+    parser.add_argument("--float64", action="store_true", help="store NAVs as float64 instead of float32")
+    args = parser.parse_args(argv)
+    store = NavStore()
+    path = build_panel(store, store.stored_schemes(), dtype=np.float64 if args.float64 else np.float32)
+    print(f"NAV panel written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from mf_analytics.store import DATA_DIR
+
+PEER_QUANTILES_PATH = os.path.join(DATA_DIR, "peer_quantiles.parquet")
+PEER_METRICS = ("CAGR", "Rolling5Y", "SIPXIRR5Y")
+# Quantile grid stored per category and metric (0th to 100th percentile)
+GRID = np.arange(101)
+MIN_PEERS = 5
+
+
+def build_peer_quantiles(leaderboard, metrics=PEER_METRICS, min_peers=MIN_PEERS):
+    """
+    One row per (category, metric) holding the 101 percentiles of that metric
+    across the category as float32 columns q0..q100, plus the peer count.
+    """
+    rows = []
+    for category, group in leaderboard.groupby("Category", observed=True):
+        for metric in metrics:
+            if metric not in group:
+                continue
+            values = group[metric].dropna().to_numpy(dtype=np.float64)
+            if len(values) < min_peers:
+                continue
+            rows.append([str(category), metric, len(values), *np.percentile(values, GRID)])
+    columns = ["Category", "Metric", "Peers"] + [f"q{q}" for q in GRID]
+    table = pd.DataFrame(rows, columns=columns)
+    table[columns[3:]] = table[columns[3:]].astype(np.float32)
+    table["Category"] = table["Category"].astype("category")
+    table["Metric"] = table["Metric"].astype("category")
+    return table
+
+
+class PeerTable:
+    """Percentile rank lookups against precomputed category quantile tables."""
+
+    def __init__(self, table):
+        grid_cols = [f"q{q}" for q in GRID]
+        self.quantiles = {}
+        self.peers = {}
+        for row, quantiles in zip(
+            table[["Category", "Metric", "Peers"]].itertuples(index=False),
+            table[grid_cols].to_numpy(dtype=np.float64),
+        ):
+            self.quantiles[(row.Category, row.Metric)] = quantiles
+            self.peers[row.Category] = max(self.peers.get(row.Category, 0), row.Peers)
+
+    def percentile(self, category, metric, value):
+        """Percentile rank (0-100) of `value` within its category, NaN if unknown."""
+        quantiles = self.quantiles.get((category, metric))
+        if quantiles is None or value is None or np.isnan(value):
+            return np.nan
+        return float(np.interp(value, quantiles, GRID))
+
+
+def save_peer_quantiles(table, path=PEER_QUANTILES_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    table.to_parquet(path, index=False)
+
+
+def load_peer_table(path=PEER_QUANTILES_PATH):
+    """PeerTable from the batch job's output, or None if it has not been run."""
+    return PeerTable(pd.read_parquet(path)) if os.path.exists(path) else None
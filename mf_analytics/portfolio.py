@@ -0,0 +1,135 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from mf_analytics.risk import risk_metrics
+from mf_analytics.sip import simulate_sip
+from mf_analytics.xirr import xirr_batch, year_fractions
+
+REBALANCE_RULES = {"none": "Buy and hold", "calendar": "Calendar", "band": "Threshold band"}
+CALENDAR_FREQUENCIES = {"monthly": "M", "quarterly": "Q", "yearly": "Y"}
+
+
+def common_rows(matrix):
+    """Slice of rows from the first date on which every fund has a NAV."""
+    complete = np.flatnonzero(~np.isnan(matrix).any(axis=1))
+    return slice(complete[0], None) if len(complete) else slice(0, 0)
+
+
+def rebalance_rows(dates, frequency="quarterly"):
+    """Row of the first trading day of every new calendar period (row 0 excluded)."""
+    periods = pd.DatetimeIndex(dates).to_period(CALENDAR_FREQUENCIES[frequency]).asi8
+    return np.flatnonzero(periods[1:] != periods[:-1]) + 1
+
+
+def _anchored(nav, weights, anchors):
+    """
+    Portfolio value for every weight row when holdings are reset to target
+    weights at each row in `anchors`, with row 0 always an anchor.
+
+    Between anchors the portfolio is buy and hold, so its growth since the
+    last anchor is one matrix product of NAV relatives with the weights.
+    Growth over whole segments is then chained with a cumulative product.
+    """
+    anchors = np.concatenate([[0], anchors]).astype(np.int64)
+    segment = np.searchsorted(anchors, np.arange(len(nav)), side="right") - 1
+    growth = (nav / nav[anchors[segment]]) @ weights.T                 # (dates, combos)
+    # Value of each segment's holdings on the next anchor date, just before resetting
+    seg_end = (nav[anchors[1:]] / nav[anchors[:-1]]) @ weights.T        # (segments - 1, combos)
+    level = np.vstack([np.ones((1, len(weights))), np.cumprod(seg_end, axis=0)])
+    return level[segment] * growth
+
+
+def _banded(nav, weights, band):
+    """
+    Portfolio value with a reset to target weights whenever any fund drifts
+    more than `band` (absolute weight) from its target. Rebalancing is path
+    dependent, so this steps through dates, but each step updates every
+    weight combination at once.
+    """
+    units = weights / nav[0]
+    values = np.empty((len(nav), len(weights)))
+    rebalances = np.zeros(len(weights), dtype=np.int64)
+    for t in range(len(nav)):
+        holdings = units * nav[t]
+        total = holdings.sum(axis=1)
+        values[t] = total
+        drift = np.abs(holdings / total[:, None] - weights).max(axis=1) > band
+        if drift.any():
+            units[drift] = total[drift, None] * weights[drift] / nav[t]
+            rebalances += drift
+    return values, rebalances
+
+
+def backtest(dates, matrix, weights, rule="none", frequency="quarterly", band=0.05):
+    """
+    Backtest weighted portfolios of the columns of an aligned NAV matrix.
+
+    `weights` is one weight vector or a (combos, funds) array. Rows are
+    normalized to sum to 1. The run starts on the first date every fund has a
+    NAV. Returns (dates, portfolio NAV starting at 100 with one column per
+    combo, number of rebalances per combo).
+    """
+    rows = common_rows(np.asarray(matrix, dtype=np.float64))
+    dates = pd.DatetimeIndex(dates)[rows]
+    nav = np.asarray(matrix, dtype=np.float64)[rows]
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    weights = weights / weights.sum(axis=1, keepdims=True)
+    if not len(nav):
+        return dates, np.empty((0, len(weights))), np.zeros(len(weights), dtype=np.int64)
+
+    if rule == "none":
+        values = _anchored(nav, weights, [])
+        rebalances = np.zeros(len(weights), dtype=np.int64)
+    elif rule == "calendar":
+        anchors = rebalance_rows(dates, frequency)
+        values = _anchored(nav, weights, anchors)
+        rebalances = np.full(len(weights), len(anchors))
+    elif rule == "band":
+        values, rebalances = _banded(nav, weights, band)
+    else:
+        raise ValueError(f"Unknown rebalancing rule: {rule}")
+    return dates, values / values[0] * 100, rebalances
+
+
+def sip_xirr(dates, values, amount=5000, years=5):
+    """
+    Monthly SIP XIRR (%) into each portfolio column, treating the portfolio
+    NAV like a fund's NAV. All columns share the SIP dates, so they are
+    solved as one batch.
+    """
+    sip = simulate_sip(pd.DataFrame({"date": dates, "nav": values[:, 0]}), amount=amount, years=years)
+    if not len(sip.ledger):
+        return np.full(values.shape[1], np.nan)
+    rows = pd.DatetimeIndex(dates).searchsorted(sip.ledger["nav_date"])
+    amounts = sip.ledger["amount"].to_numpy()
+    final = (amounts[:, None] / values[rows]).sum(axis=0) * values[-1]
+    cashflows = np.hstack([np.broadcast_to(-amounts, (values.shape[1], len(amounts))), final[:, None]])
+    times = np.broadcast_to(year_fractions(sip.dates), cashflows.shape)
+    return xirr_batch(cashflows, times) * 100
+
+
+def portfolio_summary(dates, values, rebalances, labels=None, sip_amount=5000, sip_years=5):
+    """CAGR, SIP XIRR, rebalance count and the risk metrics of every portfolio column."""
+    labels = labels if labels is not None else [f"Portfolio {i + 1}" for i in range(values.shape[1])]
+    years = (dates[-1] - dates[0]).days / 365
+    summary = risk_metrics(dates, labels, values)
+    summary.insert(0, "CAGR (%)", ((values[-1] / values[0]) ** (1 / years) - 1) * 100 if years > 0 else np.nan)
+    summary.insert(1, f"{sip_years}Y SIP XIRR (%)", sip_xirr(dates, values, sip_amount, sip_years))
+    summary.insert(2, "Rebalances", rebalances)
+    return summary
+
+
+def weight_grid(n_funds, step=0.1, min_weight=0.0):
+    """
+    Every weight vector over `n_funds` funds in multiples of `step` that sums
+    to 1 with no weight below `min_weight`, as a (combos, funds) array.
+    """
+    units = int(round(1 / step))
+    # Stars and bars: choose n_funds - 1 cut points among units + n_funds - 1 slots
+    cuts = np.array(list(combinations(range(units + n_funds - 1), n_funds - 1)), dtype=np.int64)
+    cuts = cuts.reshape(len(cuts), n_funds - 1)
+    bounds = np.hstack([np.full((len(cuts), 1), -1), cuts, np.full((len(cuts), 1), units + n_funds - 1)])
+    grid = (np.diff(bounds, axis=1) - 1) / units
+    return grid[(grid >= min_weight - 1e-12).all(axis=1)]
@@ -0,0 +1,180 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mf_analytics.downsample import CHART_DEFAULTS, downsample_dict
+
+# Figures are drawn without pyplot (Agg canvas, no GUI backend) and reused per thread.
+# matplotlib and fpdf are imported on first use so importing this module stays cheap.
+_figures = threading.local()
+
+
+def _figure(name, figsize):
+    figs = _figures.__dict__.setdefault("figs", {})
+    if name not in figs:
+        from matplotlib.figure import Figure
+
+        figs[name] = Figure(figsize=figsize)
+    fig = figs[name]
+    fig.clear()
+    return fig
+
+
+def _png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    buf.seek(0)
+    return buf
+
+
+def rolling_chart_png(rolling_returns):
+    fig = _figure("rolling", (10, 5))
+    ax = fig.subplots()
+    for fund, rolling_5yr in rolling_returns.items():
+        ax.plot(rolling_5yr.index, rolling_5yr.values, label=fund)
+    ax.set_title("5-Year Rolling CAGR Comparison")
+    ax.set_ylabel("Rolling CAGR (%)")
+    ax.grid(True)
+    ax.legend()
+    return _png(fig)
+
+
+def xirr_chart_png(funds, xirr_values):
+    fig = _figure("xirr", (8, 4))
+    ax = fig.subplots()
+    ax.bar(funds, xirr_values, color='blue')
+    ax.set_title("5-Year SIP XIRR Simulation")
+    ax.set_ylabel("XIRR (%)")
+    for i, v in enumerate(xirr_values):
+        ax.text(i, v + 0.5, f"{v:.2f}%", ha='center', fontsize=9)
+    return _png(fig)
+
+
+def projection_chart_png(projections, years):
+    fig = _figure("projection", (10, 5))
+    ax = fig.subplots()
+    for fund, bands in projections.items():
+        years_axis = bands["Month"] / 12
+        line, = ax.plot(years_axis, bands["P50"], label=fund)
+        ax.fill_between(years_axis, bands["P10"], bands["P90"], color=line.get_color(), alpha=0.15)
+    first = next(iter(projections.values()))
+    ax.plot(first["Month"] / 12, first["Invested"], color="grey", linestyle="--", label="Invested")
+    ax.set_title(f"Projected Corpus over {years} Years (median, 10th-90th percentile band)")
+    ax.set_xlabel("Years")
+    ax.set_ylabel("Corpus (Rs.)")
+    ax.grid(True)
+    ax.legend()
+    return _png(fig)
+
+
+def create_pdf(results_df, charts, combined_chart_buf, pdf_xirr_buf, sip_label="Rs. 5000/month"):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("helvetica", size=14)
+    pdf.cell(200, 10, "Mutual Fund Comparison Report", ln=True, align="C")
+    pdf.set_font("helvetica", size=11)
+    pdf.ln(5)
+    for _, row in results_df.iterrows():
+        pdf.multi_cell(
+            0, 6,
+            f"Fund: {row['Fund']}\n"
+            f"NAV: {row['NAV']:.2f}\n"
+            f"Annualized CAGR: {row['Annualized CAGR']:.2f}%\n"
+            f"5Y Avg Rolling CAGR: {row['5Y Avg Rolling CAGR']:.2f}%\n"
+            f"5Y SIP XIRR: {row.get('XIRR_5Y_SIP', np.nan):.2f}%\n"
+        )
+        pdf.ln(3)
+
+    # Combined rolling return chart
+    pdf.add_page()
+    pdf.cell(200, 10, "Combined 5-Year Rolling CAGR", ln=True)
+    pdf.image(combined_chart_buf, w=170)
+
+    # XIRR chart
+    pdf.add_page()
+    pdf.cell(200, 10, f"5-Year SIP XIRR Simulation (Considering {sip_label})", ln=True)
+    pdf.image(pdf_xirr_buf, w=170)
+
+    for title, chart_buf in charts.items():
+        pdf.add_page()
+        pdf.cell(200, 10, title, ln=True)
+        pdf.image(chart_buf, w=170)
+
+    buf = io.BytesIO()
+    pdf.output(buf)
+    return buf.getvalue()
+
+
+def build_report(results_df, rolling_returns, sip_label, projections=None, projection_title=None,
+                 rolling_chart=None):
+    """Draw the report charts and build the PDF (bytes)."""
+    rolling_chart = rolling_chart or CHART_DEFAULTS["pdf_rolling_cagr"]
+    combined_chart_buf = rolling_chart_png(downsample_dict(rolling_returns, **rolling_chart))
+    pdf_xirr_buf = xirr_chart_png(results_df["Fund"].tolist(), results_df["XIRR_5Y_SIP"].tolist())
+    charts = {}
+    if projections:
+        years = len(next(iter(projections.values()))) // 12
+        charts[projection_title or "Projected Outcomes"] = projection_chart_png(projections, years)
+    return create_pdf(results_df, charts, combined_chart_buf, pdf_xirr_buf, sip_label)
+
+
+def report_key(results_df, rolling_returns, sip_label, projections=None, projection_title=None):
+    """Hash of everything that ends up in the report."""
+    h = hashlib.sha1(sip_label.encode())
+    h.update(pd.util.hash_pandas_object(results_df, index=True).to_numpy().tobytes())
+    for group in (rolling_returns, projections or {}):
+        for fund, data in group.items():
+            h.update(fund.encode())
+            h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    h.update(str(projection_title).encode())
+    return h.hexdigest()
+
+
+class ReportJobs:
+    """
+    Builds reports on a background worker, keeping the latest results by key.
+    A job that fails is forgotten once it finishes, so asking again retries it.
+    """
+
+    def __init__(self, max_workers=1, max_items=16):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self.max_items = max_items
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Future for a report already requested, or None."""
+        with self.lock:
+            future = self.jobs.get(key)
+            if future is not None:
+                self.jobs.move_to_end(key)
+            return future
+
+    def submit(self, key, fn, *args):
+        with self.lock:
+            new = key not in self.jobs
+            if new:
+                self.jobs[key] = self.pool.submit(fn, *args)
+                while len(self.jobs) > self.max_items:
+                    self.jobs.popitem(last=False)
+            self.jobs.move_to_end(key)
+            future = self.jobs[key]
+        if new:
+            # Outside the lock: the callback runs at once if the job has already finished
+            future.add_done_callback(lambda f: self._forget_failed(key, f))
+        return future
+
+    def _forget_failed(self, key, future):
+        if future.exception() is None:
+            return
+        with self.lock:
+            if self.jobs.get(key) is future:
+                del self.jobs[key]
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+RISK_FREE = 0.065  # annual, roughly the Indian 91-day T-bill yield
+
+
+def daily_returns(matrix):
+    """Simple returns of a date-by-fund NAV matrix (one row shorter)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return matrix[1:] / matrix[:-1] - 1
+
+
+def drawdowns(dates, matrix):
+    """
+    Max drawdown (%) per column with its peak, trough and recovery dates and its
+    duration in calendar days (to the last date if not yet recovered).
+    """
+    n_rows, n_cols = matrix.shape
+    cols = np.arange(n_cols)
+    peak = np.fmax.accumulate(matrix, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = matrix / peak - 1
+    dd_filled = np.where(np.isnan(dd), 0.0, dd)
+
+    rows = np.arange(n_rows)[:, None]
+    at_peak = dd_filled >= 0
+    last_peak = np.maximum.accumulate(np.where(at_peak, rows, 0), axis=0)
+
+    trough = dd_filled.argmin(axis=0)
+    peak_row = last_peak[trough, cols]
+    recovered = at_peak & (rows > trough)
+    has_recovered = recovered.any(axis=0)
+    recovery_row = np.where(has_recovered, recovered.argmax(axis=0), n_rows - 1)
+
+    days = dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    return {
+        "Max Drawdown (%)": dd_filled[trough, cols] * 100,
+        "Drawdown Peak": dates[peak_row],
+        "Drawdown Trough": dates[trough],
+        "Recovered": np.where(has_recovered, dates[recovery_row].strftime("%d-%b-%Y"), "Not yet"),
+        "Drawdown Duration (days)": days[recovery_row] - days[peak_row],
+    }
+
+
+def risk_metrics(dates, names, matrix, benchmark=None, risk_free=RISK_FREE):
+    """
+    Annualized volatility, Sharpe, Sortino, max drawdown and, when `benchmark`
+    (a 1-D NAV array on the same dates) is given, beta and downside capture,
+    for every column of `matrix` in one vectorized pass.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    r = daily_returns(matrix)
+    valid = ~np.isnan(r)
+    count = valid.sum(axis=0)
+    rf_daily = (1 + risk_free) ** (1 / TRADING_DAYS) - 1
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(r, axis=0) / count
+        vol = np.sqrt(np.nansum((r - mean) ** 2, axis=0) / (count - 1))
+        excess = r - rf_daily
+        downside = np.sqrt(np.nansum(np.minimum(excess, 0) ** 2, axis=0) / count)
+        ann_excess = (mean - rf_daily) * TRADING_DAYS
+
+        out = {
+            "Volatility (%)": vol * np.sqrt(TRADING_DAYS) * 100,
+            "Sharpe": ann_excess / (vol * np.sqrt(TRADING_DAYS)),
+            "Sortino": ann_excess / (downside * np.sqrt(TRADING_DAYS)),
+        }
+        out.update(drawdowns(dates, matrix))
+
+        if benchmark is not None:
+            rb = daily_returns(np.asarray(benchmark, dtype=np.float64)[:, None])
+            both = valid & ~np.isnan(rb)
+            n = both.sum(axis=0)
+            ri = np.where(both, r, 0.0)
+            rbb = np.where(both, rb, 0.0)
+            mean_i = ri.sum(axis=0) / n
+            mean_b = rbb.sum(axis=0) / n
+            cov = (np.where(both, (ri - mean_i) * (rbb - mean_b), 0.0)).sum(axis=0) / (n - 1)
+            var_b = (np.where(both, (rbb - mean_b) ** 2, 0.0)).sum(axis=0) / (n - 1)
+            out["Beta"] = cov / var_b
+
+            # Geometric mean daily return on the benchmark's down days, fund vs benchmark
+            down = both & (rb < 0)
+            n_down = down.sum(axis=0)
+            fund_down = np.expm1(np.where(down, np.log1p(ri), 0.0).sum(axis=0) / n_down)
+            bench_down = np.expm1(np.where(down, np.log1p(rbb), 0.0).sum(axis=0) / n_down)
+            out["Downside Capture (%)"] = fund_down / bench_down * 100
+
+    return pd.DataFrame(out, index=pd.Index(names, name="Fund"))
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+HORIZONS = (1, 3, 5, 7, 10)
+
+# Spacing between funds when (fund, day) pairs are packed into one sort key
+_KEY_STRIDE = 1 << 24
+
+
+def horizon_label(years):
+    return f"{years}Y"
+
+
+def rolling_cagr(nav_frames, horizons=HORIZONS):
+    """
+    Rolling CAGR (%) for every fund in `nav_frames` ({name: nav_df}) and horizon.
+
+    Windows are calendar years: each date is paired with the last NAV on or
+    before the same date `years` earlier (an as-of join). All funds are packed
+    into one sorted (fund, day) key so every horizon is a single
+    `searchsorted` across the whole selection. Returns {name: DataFrame}
+    indexed by date with one column per horizon ("5Y"); NaN where the fund
+    is younger than the horizon.
+    """
+    names = list(nav_frames)
+    if not names:
+        return {}
+    days = [nav_frames[n]["date"].to_numpy(dtype="datetime64[D]").astype(np.int64) for n in names]
+    navs = [nav_frames[n]["nav"].to_numpy(dtype=np.float64) for n in names]
+    lengths = np.array([len(d) for d in days])
+
+    fund_id = np.repeat(np.arange(len(names), dtype=np.int64), lengths)
+    day = np.concatenate(days)
+    nav = np.concatenate(navs)
+    key = fund_id * _KEY_STRIDE + day
+    first_day = np.repeat([d[0] if len(d) else 0 for d in days], lengths)
+    dates = day.astype("datetime64[D]")
+
+    out = np.full((len(day), len(horizons)), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, years in enumerate(horizons):
+            past = pd.DatetimeIndex(dates) - pd.DateOffset(years=years)
+            past = past.to_numpy(dtype="datetime64[D]").astype(np.int64)
+            valid = past >= first_day
+            pos = np.searchsorted(key, fund_id[valid] * _KEY_STRIDE + past[valid], side="right") - 1
+            out[valid, j] = ((nav[valid] / nav[pos]) ** (1 / years) - 1) * 100
+
+    columns = [horizon_label(y) for y in horizons]
+    bounds = np.cumsum(lengths)[:-1]
+    return {
+        name: pd.DataFrame(block, index=pd.DatetimeIndex(idx, name="date"), columns=columns)
+        for name, block, idx in zip(names, np.split(out, bounds), np.split(dates, bounds))
+    }
+
+
+def rolling_summary(rolling, threshold=0.0):
+    """Mean, median, min, max and % of windows above `threshold` per fund and horizon."""
+    if not rolling:
+        return pd.DataFrame()
+    long = (
+        pd.concat(rolling, names=["Fund", "date"])
+        .melt(ignore_index=False, var_name="Horizon", value_name="cagr")
+        .dropna()
+        .reset_index()
+    )
+    long["Fund"] = pd.Categorical(long["Fund"], categories=list(rolling))
+    long["Horizon"] = pd.Categorical(long["Horizon"], categories=next(iter(rolling.values())).columns)
+    long["beats"] = long["cagr"] > threshold
+    summary = long.groupby(["Fund", "Horizon"], observed=True).agg(
+        Mean=("cagr", "mean"),
+        Median=("cagr", "median"),
+        Min=("cagr", "min"),
+        Max=("cagr", "max"),
+        Windows=("cagr", "size"),
+        Beats=("beats", "mean"),
+    )
+    summary["Beats"] *= 100
+    return summary.rename(columns={"Beats": f"% > {threshold:g}%"})
@@ -0,0 +1,111 @@
+import difflib
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Score of a query term against a scheme name token
+EXACT, PREFIX, FUZZY = 2.0, 1.0, 0.5
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def _option(tokens):
+    if "growth" in tokens:
+        return "Growth"
+    if tokens & {"idcw", "dividend", "payout", "reinvestment", "bonus"}:
+        return "IDCW"
+    return "Other"
+
+
+class SchemeIndex:
+    """Token/prefix inverted index over scheme names with plan, option and AMC filters."""
+
+    def __init__(self, master):
+        names = master["SchemeName"].tolist()
+        codes = master["SchemeCode"].tolist()
+        self.names = np.array(names, dtype=object)
+        self.name_len = np.array([len(n) for n in names], dtype=np.int32)
+        # First code wins for duplicated names, as the old linear scan did
+        self.code_by_name = {}
+        for name, code in zip(names, codes):
+            self.code_by_name.setdefault(name, code)
+
+        postings = {}
+        direct = np.zeros(len(names), dtype=bool)
+        option = []
+        for row, name in enumerate(names):
+            tokens = set(tokenize(name))
+            for token in tokens:
+                postings.setdefault(token, []).append(row)
+            direct[row] = "direct" in tokens
+            option.append(_option(tokens))
+        self.postings = {t: np.array(rows, dtype=np.int32) for t, rows in postings.items()}
+        self.vocab = sorted(self.postings)
+        self.direct = direct
+        self.option = np.array(option, dtype=object)
+
+        # Missing categories stay None (not "nan") so callers fall back to mfapi's category
+        categories = (
+            master["Category"].astype(object).where(master["Category"].notna(), None)
+            if "Category" in master else [None] * len(codes)
+        )
+        self.category_by_code = dict(zip(codes, categories))
+
+        amc = master["AMC"].astype("category") if "AMC" in master else None
+        self.amcs = [] if amc is None else [str(a) for a in amc.cat.categories]
+        self.amc_codes = np.full(len(names), -1) if amc is None else amc.cat.codes.to_numpy()
+
+    def _term_rows(self, term):
+        """Rows matching one query term and their scores: prefix, else fuzzy."""
+        lo = bisect_left(self.vocab, term)
+        hi = bisect_left(self.vocab, term + "\uffff")
+        tokens = self.vocab[lo:hi]
+        weight = PREFIX
+        if not tokens:
+            tokens = difflib.get_close_matches(term, self.vocab, n=5, cutoff=0.75)
+            weight = FUZZY
+        if not tokens:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        rows = np.unique(np.concatenate([self.postings[t] for t in tokens]))
+        scores = np.full(len(rows), weight)
+        if term in self.postings:
+            scores[np.isin(rows, self.postings[term])] = EXACT
+        return rows, scores
+
+    def filter_mask(self, plan=None, option=None, amc=None):
+        mask = np.ones(len(self.names), dtype=bool)
+        if plan is not None:
+            mask &= self.direct == (plan == "Direct")
+        if option is not None:
+            mask &= self.option == option
+        if amc is not None:
+            mask &= self.amc_codes == (self.amcs.index(amc) if amc in self.amcs else -2)
+        return mask
+
+    def search(self, query, limit=50, plan=None, option=None, amc=None, match_all=False):
+        """
+        Scheme names best matching `query`, ranked by term score then name length.
+        Names must match every term if any do; otherwise any term counts, unless
+        `match_all` is set. `plan` is "Direct"/"Regular", `option` is "Growth"/"IDCW".
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        score = np.zeros(len(self.names))
+        hits = np.zeros(len(self.names), dtype=np.int16)
+        for term in terms:
+            rows, term_score = self._term_rows(term)
+            score[rows] += term_score
+            hits[rows] += 1
+
+        mask = hits == len(terms)
+        if not (mask.any() or match_all):
+            mask = hits > 0
+        rows = np.flatnonzero(mask & self.filter_mask(plan, option, amc))
+        order = np.lexsort((self.name_len[rows], -score[rows], -hits[rows]))[:limit]
+        return self.names[rows[order]].tolist()
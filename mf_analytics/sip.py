@@ -0,0 +1,132 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from numpy.lib.stride_tricks import sliding_window_view
+
+from mf_analytics.xirr import xirr_batch
+
+# Instalment calendars (pandas offset aliases)
+SIP_FREQUENCIES = {
+    "weekly": "W-MON",
+    "monthly": "MS",
+    "quarterly": "QS",
+}
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+class SipResult(NamedTuple):
+    ledger: pd.DataFrame      # one row per instalment
+    cashflows: np.ndarray     # instalments (negative) + final redemption value
+    dates: pd.DatetimeIndex   # dates matching `cashflows`
+    final_value: float
+
+
+def simulate_sip(nav_df, amount=5000, frequency="monthly", step_up=0.0,
+                 start=None, end=None, years=5):
+    """
+    Simulate a SIP over `nav_df` (columns date, nav, sorted by date).
+
+    Each instalment buys at the last NAV on or before its date, looked up for
+    all instalments with one `searchsorted`. `step_up` raises the instalment
+    by that fraction every year. Without `start`, the window is the `years`
+    before the last NAV date (or `end`).
+    """
+    if frequency not in SIP_FREQUENCIES:
+        raise ValueError(f"Unknown SIP frequency: {frequency}")
+
+    dates = nav_df["date"].to_numpy(dtype="datetime64[ns]")
+    navs = nav_df["nav"].to_numpy(dtype=np.float64)
+
+    end_pos = len(dates)
+    if end is not None:
+        end_pos = np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side="right")
+    if end_pos == 0:
+        raise ValueError("No NAV available on or before the SIP end date")
+    end_date = pd.Timestamp(dates[end_pos - 1])
+    start_date = pd.Timestamp(start) if start is not None else end_date - relativedelta(years=years)
+
+    start_pos = np.searchsorted(dates, np.datetime64(start_date), side="left")
+    dates, navs = dates[start_pos:end_pos], navs[start_pos:end_pos]
+
+    sip_dates = pd.date_range(start=start_date, end=end_date, freq=SIP_FREQUENCIES[frequency])
+    nav_idx = np.searchsorted(dates, sip_dates.to_numpy(), side="right") - 1
+    has_nav = nav_idx >= 0  # skip instalments before the first NAV in the window
+    sip_dates, nav_idx = sip_dates[has_nav], nav_idx[has_nav]
+
+    # Step-up applies from each anniversary of the window start
+    span = end_date.year - start_date.year + 2
+    anniversaries = pd.DatetimeIndex([start_date + relativedelta(years=k) for k in range(span)])
+    year_no = np.searchsorted(anniversaries.to_numpy(), sip_dates.to_numpy(), side="right") - 1
+    amounts = amount * (1 + step_up) ** np.maximum(year_no, 0)
+
+    nav_at = navs[nav_idx]
+    units = amounts / nav_at
+    cum_units = np.cumsum(units)
+    ledger = pd.DataFrame({
+        "date": sip_dates,
+        "nav_date": dates[nav_idx],
+        "nav": nav_at,
+        "amount": amounts,
+        "units": units,
+        "cum_units": cum_units,
+        "invested": np.cumsum(amounts),
+        "value": cum_units * nav_at,
+    })
+
+    final_value = float(cum_units[-1] * navs[-1]) if len(cum_units) else 0.0
+    cashflows = np.append(-amounts, final_value)
+    cf_dates = sip_dates.append(pd.DatetimeIndex([end_date]))
+    return SipResult(ledger, cashflows, cf_dates, final_value)
+
+
+def rolling_sip_xirr(nav_df, years=5, amount=5000):
+    """
+    SIP XIRR (%) of a monthly SIP started on every month start in the history
+    and redeemed `years` later.
+
+    All windows share one month-start NAV lookup; the (windows, instalments + 1)
+    cashflow and time matrices are built with sliding windows and solved in a
+    single `xirr_batch` call. Returns a frame of start, end and xirr.
+    """
+    dates = nav_df["date"].to_numpy(dtype="datetime64[ns]")
+    navs = nav_df["nav"].to_numpy(dtype=np.float64)
+    months = pd.date_range(pd.Timestamp(dates[0]), pd.Timestamp(dates[-1]), freq="MS")
+    n = 12 * years
+    if len(months) <= n:
+        return pd.DataFrame(columns=["start", "end", "xirr"])
+
+    month_nav = navs[np.searchsorted(dates, months.to_numpy(), side="right") - 1]
+    units = amount / month_nav
+    cum_units = np.concatenate([[0.0], np.cumsum(units)])
+    n_windows = len(months) - n
+
+    # Units bought in months i .. i+n-1, redeemed at the NAV of month i+n
+    held = cum_units[n:n + n_windows] - cum_units[:n_windows]
+    cashflows = np.full((n_windows, n + 1), -float(amount))
+    cashflows[:, -1] = held * month_nav[n:n + n_windows]
+
+    days = months.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    window_days = sliding_window_view(days, n + 1)[:n_windows]
+    times = (window_days - window_days[:, :1]) / 365
+
+    rates = xirr_batch(cashflows, times)
+    return pd.DataFrame({
+        "start": months[:n_windows],
+        "end": months[n:n + n_windows],
+        "xirr": rates * 100,
+    })
+
+
+def sip_distribution(rolling, percentiles=PERCENTILES):
+    """Percentiles, mean and share of negative outcomes of `rolling_sip_xirr` results."""
+    values = rolling["xirr"].dropna().to_numpy()
+    if not len(values):
+        return {}
+    stats = {f"P{p}": float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+    stats["Mean"] = float(values.mean())
+    stats["% Negative"] = float((values < 0).mean() * 100)
+    stats["Windows"] = len(values)
+    return stats
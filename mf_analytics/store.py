@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import requests
+
+from mf_analytics.http import MAX_WORKERS
+from mf_analytics.mfapi import fetch_nav_history
+
+DATA_DIR = os.environ.get("MF_DATA_DIR", ".mf_data")
+# Serve from disk without asking mfapi again for this many seconds
+MAX_AGE = 6 * 3600
+# MF_OFFLINE=1 never touches the network (warm start from disk only)
+OFFLINE = os.environ.get("MF_OFFLINE") == "1"
+# Scheme codes per IN (...) query, under SQLite's older 999-parameter limit
+QUERY_CHUNK = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nav (
+    scheme_code INTEGER NOT NULL,
+    day INTEGER NOT NULL,          -- days since 1970-01-01
+    nav REAL NOT NULL,
+    PRIMARY KEY (scheme_code, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS scheme (
+    scheme_code INTEGER PRIMARY KEY,
+    category TEXT,
+    checked_at REAL                -- unix time of the last mfapi check
+);
+"""
+
+
+@contextmanager
+def connect(path):
+    """SQLite connection that commits on success and is always closed."""
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+class NavStore:
+    """NAV histories persisted in SQLite and topped up incrementally from mfapi."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, "nav_history.sqlite")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return connect(self.path)
+
+    def read(self, scheme_code):
+        """Stored NAV history as a (date, nav) frame, empty if nothing is stored."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT day, nav FROM nav WHERE scheme_code = ? ORDER BY day", (int(scheme_code),)
+            ).fetchall()
+        arr = np.array(rows, dtype=np.float64).reshape(-1, 2)
+        return pd.DataFrame({
+            "date": pd.to_datetime(arr[:, 0].astype(np.int64), unit="D"),
+            "nav": arr[:, 1],
+        })
+
+    def info(self, scheme_code):
+        """(category, checked_at) for a scheme, or (None, None) if never fetched."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT category, checked_at FROM scheme WHERE scheme_code = ?", (int(scheme_code),)
+            ).fetchone()
+        return row if row else (None, None)
+
+    def _query_codes(self, sql, scheme_codes):
+        """Rows of `sql` (with an IN ({}) placeholder) over `scheme_codes`, a chunk of codes at a time."""
+        codes = [int(c) for c in scheme_codes]
+        rows = []
+        with self._connect() as conn:
+            for i in range(0, len(codes), QUERY_CHUNK):
+                chunk = codes[i:i + QUERY_CHUNK]
+                rows += conn.execute(sql.format(",".join("?" * len(chunk))), chunk).fetchall()
+        return rows
+
+    def last_dates(self, scheme_codes):
+        """{scheme code: date of its latest stored NAV} for the stored ones among `scheme_codes`."""
+        rows = self._query_codes(
+            "SELECT scheme_code, MAX(day) FROM nav WHERE scheme_code IN ({}) GROUP BY scheme_code", scheme_codes
+        )
+        return {code: pd.Timestamp(day, unit="D") for code, day in rows}
+
+    def trading_days(self, scheme_codes):
+        """Sorted datetime64[D] array of every day on which any of `scheme_codes` has a stored NAV."""
+        rows = self._query_codes("SELECT DISTINCT day FROM nav WHERE scheme_code IN ({})", scheme_codes)
+        days = np.array([r[0] for r in rows], dtype=np.int64)
+        return np.unique(days).astype("datetime64[D]")
+
+    def stored_schemes(self):
+        with self._connect() as conn:
+            return [r[0] for r in conn.execute("SELECT scheme_code FROM scheme")]
+
+    def append(self, scheme_code, nav_df, category=None):
+        """Add NAVs to the store and mark the scheme as freshly checked."""
+        code = int(scheme_code)
+        rows = []
+        if nav_df is not None and len(nav_df):
+            days = nav_df["date"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+            rows = zip([code] * len(days), days.tolist(), nav_df["nav"].astype(float).tolist())
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO nav VALUES (?, ?, ?)", rows)
+            conn.execute(
+                "INSERT INTO scheme VALUES (?, ?, ?) ON CONFLICT(scheme_code) DO UPDATE SET "
+                "category = COALESCE(excluded.category, category), checked_at = excluded.checked_at",
+                (code, category, time.time()),
+            )
+
+    def update(self, scheme_code):
+        """Fetch only the NAVs newer than the last stored date and append them."""
+        last = self.last_dates([scheme_code]).get(int(scheme_code))
+        start = last + pd.Timedelta(days=1) if last is not None else None
+        new, category = fetch_nav_history(scheme_code, start_date=start)
+        self.append(scheme_code, new, category)
+
+    def history(self, scheme_code, max_age=MAX_AGE, offline=OFFLINE):
+        """
+        (nav_df, category) for a scheme, nav_df being None when nothing is stored.
+
+        Answers from disk when the scheme was checked within `max_age` seconds
+        or `offline` is set; otherwise tops the store up first. If mfapi is
+        unreachable the stored history is returned as is.
+        """
+        category, checked_at = self.info(scheme_code)
+        fresh = checked_at is not None and time.time() - checked_at < max_age
+        if not (offline or fresh):
+            try:
+                self.update(scheme_code)
+            except (requests.RequestException, ValueError):
+                pass
+            category, _ = self.info(scheme_code)
+        nav_df = self.read(scheme_code)
+        if nav_df.empty:
+            return None, category
+        return nav_df, category
+
+    def history_many(self, scheme_codes, max_workers=MAX_WORKERS, **kwargs):
+        """
+        Load several schemes concurrently over the shared session, yielding
+        (scheme_code, (nav_df, category)) in completion order.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(self.history, code, **kwargs): code for code in scheme_codes}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
@@ -0,0 +1,135 @@
+"""
+Pluggable HTTP transport: live, record or replay, optionally pointed at a
+stand-in server instead of the real APIs.
+
+    MF_HTTP_MODE=record   MF_HTTP_CASSETTES=cassettes/  streamlit run ...   # save responses
+    MF_HTTP_MODE=replay   MF_HTTP_CASSETTES=cassettes/  streamlit run ...   # no network at all
+    MF_HTTP_UPSTREAM=http://127.0.0.1:8765              streamlit run ...   # use benchmarks.mockserver
+
+With MF_HTTP_UPSTREAM set, https://api.mfapi.in/mf/1 is sent to
+http://127.0.0.1:8765/api.mfapi.in/mf/1, so one server can stand in for
+every API. Recordings are keyed by method and URL with credentials removed,
+so they can be replayed with any API key and shared without leaking it.
+"""
+import hashlib
+import json
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+MODES = ("live", "record", "replay")
+MODE = os.environ.get("MF_HTTP_MODE", "live")
+CASSETTE_DIR = os.environ.get(
+    "MF_HTTP_CASSETTES", os.path.join(os.environ.get("MF_DATA_DIR", ".mf_data"), "cassettes")
+)
+UPSTREAM = os.environ.get("MF_HTTP_UPSTREAM") or None
+# Query parameters that carry credentials
+SECRET_PARAMS = frozenset({"key", "token", "apikey", "api_key"})
+# The body is stored decoded, so these would describe it wrongly on replay
+_DROP_HEADERS = frozenset({"content-encoding", "transfer-encoding", "content-length", "connection"})
+
+
+def redact(url):
+    """`url` with credential query parameters removed."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def redirect(url, upstream):
+    """Send `url` to `upstream`, keeping the original host as the first path segment."""
+    parts = urlsplit(url)
+    base = urlsplit(upstream)
+    path = base.path.rstrip("/") + "/" + parts.netloc + parts.path
+    return urlunsplit((base.scheme, base.netloc, path, parts.query, ""))
+
+
+class NoRecording(requests.ConnectionError):
+    """Replay mode was asked for a request that was never recorded."""
+
+
+class RecordReplayAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that can save every response to `cassette_dir` (record), answer
+    only from saved responses (replay) or pass through (live). Retries, pooling
+    and timeouts of the live path are HTTPAdapter's own.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["mode", "cassette_dir", "upstream"]
+
+    def __init__(self, mode=MODE, cassette_dir=CASSETTE_DIR, upstream=UPSTREAM, **kwargs):
+        if mode not in MODES:
+            raise ValueError(f"Unknown HTTP mode: {mode}")
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.upstream = upstream
+        super().__init__(**kwargs)
+
+    def _path(self, request):
+        key = f"{request.method} {redact(request.url)}"
+        if request.body:
+            body = request.body if isinstance(request.body, bytes) else str(request.body).encode()
+            key += " " + hashlib.sha1(body).hexdigest()
+        return os.path.join(self.cassette_dir, hashlib.sha1(key.encode()).hexdigest()[:24])
+
+    def send(self, request, **kwargs):
+        path = self._path(request)
+        if self.mode == "replay":
+            return self._replay(request, path)
+        original_url = request.url
+        if self.upstream:
+            request.url = redirect(request.url, self.upstream)
+        response = super().send(request, **kwargs)
+        response.url = original_url
+        if self.mode == "record":
+            self._record(response, path)
+        return response
+
+    def _record(self, response, path):
+        body = response.content  # reads a streamed body in full, which replay needs anyway
+        os.makedirs(self.cassette_dir, exist_ok=True)
+        meta = {
+            "method": response.request.method,
+            "url": redact(response.url),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+        }
+        # Body first, then the metadata file that marks the recording complete
+        with open(path + ".body", "wb") as f:
+            f.write(body)
+        tmp = path + ".json.tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp, path + ".json")
+
+    def _replay(self, request, path):
+        try:
+            with open(path + ".json") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            raise NoRecording(f"No recording for {request.method} {redact(request.url)}", request=request)
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response.reason = meta.get("reason")
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+def transport_adapter(mode=MODE, cassette_dir=CASSETTE_DIR, upstream=UPSTREAM, **kwargs):
+    """Adapter for the given transport: a plain HTTPAdapter when live and not redirected."""
+    if mode == "live" and not upstream:
+        return HTTPAdapter(**kwargs)
+    return RecordReplayAdapter(mode, cassette_dir, upstream, **kwargs)
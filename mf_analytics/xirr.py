@@ -0,0 +1,116 @@
+import numpy as np
+
+# Rates tried when looking for a sign change of the NPV (bisection fallback)
+BRACKET_GRID = np.array([
+    -0.999, -0.99, -0.9, -0.75, -0.5, -0.25, -0.1, 0.0, 0.05, 0.1,
+    0.2, 0.35, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0, 100.0,
+])
+
+
+def year_fractions(dates):
+    """Years elapsed since the first date (days / 365), computed once per series."""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    return (dates - dates[0]).astype(np.float64) / 365
+
+
+def _npv(rates, cashflows, times):
+    return (cashflows * (1 + rates[:, None]) ** -times).sum(axis=1)
+
+
+def _bisect(cashflows, times, tol, max_iter):
+    n = cashflows.shape[0]
+    result = np.full(n, np.nan)
+
+    # NPV on the whole grid: (series, grid points)
+    grid_npv = (
+        cashflows[:, None, :] * (1 + BRACKET_GRID[None, :, None]) ** -times[:, None, :]
+    ).sum(axis=2)
+    sign_change = np.signbit(grid_npv[:, :-1]) != np.signbit(grid_npv[:, 1:])
+    has_bracket = sign_change.any(axis=1)
+    if not has_bracket.any():
+        return result
+
+    first = sign_change.argmax(axis=1)[has_bracket]
+    cf, t = cashflows[has_bracket], times[has_bracket]
+    lo, hi = BRACKET_GRID[first], BRACKET_GRID[first + 1]
+    f_lo = grid_npv[has_bracket, first]
+
+    for _ in range(max_iter):
+        mid = (lo + hi) / 2
+        f_mid = _npv(mid, cf, t)
+        same_side = np.signbit(f_mid) == np.signbit(f_lo)
+        lo = np.where(same_side, mid, lo)
+        f_lo = np.where(same_side, f_mid, f_lo)
+        hi = np.where(same_side, hi, mid)
+        if np.all(hi - lo < tol):
+            break
+
+    result[has_bracket] = (lo + hi) / 2
+    return result
+
+
+def xirr_batch(cashflows, times, guess=0.10, tol=1e-6, max_iter=200):
+    """
+    Solve XIRR for many cashflow series at once.
+
+    `cashflows` and `times` are 2-D arrays of shape (series, flows); `times` are
+    year fractions from `year_fractions`. Shorter series are padded with zero
+    cashflows. Series where Newton diverges, hits a zero derivative or does not
+    converge are re-solved by bisection. Returns NaN where no rate exists.
+    """
+    cashflows = np.atleast_2d(np.asarray(cashflows, dtype=np.float64))
+    times = np.atleast_2d(np.asarray(times, dtype=np.float64))
+    n = cashflows.shape[0]
+
+    rate = np.full(n, guess, dtype=np.float64)
+    active = np.ones(n, dtype=bool)
+    converged = np.zeros(n, dtype=bool)
+
+    with np.errstate(all="ignore"):
+        for _ in range(max_iter):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+            r, cf, t = rate[idx], cashflows[idx], times[idx]
+            discount = (1 + r[:, None]) ** -t
+            f = (cf * discount).sum(axis=1)
+            df = (-t * cf * discount / (1 + r[:, None])).sum(axis=1)
+
+            new_rate = r - f / df
+            failed = (df == 0) | ~np.isfinite(new_rate) | (new_rate <= -1)
+            done = ~failed & (np.abs(new_rate - r) < tol)
+
+            rate[idx] = np.where(failed, np.nan, new_rate)
+            converged[idx[done]] = True
+            active[idx[failed | done]] = False
+
+        retry = ~converged
+        if retry.any():
+            rate[retry] = _bisect(cashflows[retry], times[retry], tol, max_iter)
+
+    return rate
+
+
+def pad_series(series):
+    """Stack ragged (cashflows, dates) pairs into zero-padded 2-D arrays."""
+    width = max(len(cf) for cf, _ in series)
+    cashflows = np.zeros((len(series), width))
+    times = np.zeros((len(series), width))
+    for i, (cf, dates) in enumerate(series):
+        cashflows[i, :len(cf)] = cf
+        times[i, :len(cf)] = year_fractions(dates)
+    return cashflows, times
+
+
+def xirr_ragged(series, **kwargs):
+    """XIRR for a list of (cashflows, dates) pairs of different lengths."""
+    if not series:
+        return np.array([])
+    cashflows, times = pad_series(series)
+    return xirr_batch(cashflows, times, **kwargs)
+
+
+def xirr(cashflows, dates):
+    """XIRR of a single cashflow series, or None when no rate can be found."""
+    rate = xirr_batch([cashflows], [year_fractions(dates)])[0]
+    return None if np.isnan(rate) else float(rate)
@@ -0,0 +1,68 @@
+"""
+The scalar implementations the vectorized engines in mf_analytics replaced,
+copied from MF_Comparison_Tool.py before the rewrite, to check the new code
+against.
+"""
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+
+def compute_rolling_cagr(df, years=5):
+    days = years * 365
+    df = df.set_index("date")
+    df["rolling_cagr"] = ((df["nav"] / df["nav"].shift(days)) ** (1/years) - 1) * 100
+    return df["rolling_cagr"].dropna()
+
+
+def xirr(cashflows, dates):
+    def npv(rate):
+        return sum(
+            cf / ((1 + rate) ** ((dt - dates[0]).days / 365))
+            for cf, dt in zip(cashflows, dates)
+        )
+    rate = 0.10
+    for _ in range(200):
+        f = npv(rate)
+        df = sum(
+            -cf * ((dt - dates[0]).days / 365) *
+            (1 + rate) ** (-((dt - dates[0]).days / 365) - 1)
+            for cf, dt in zip(cashflows, dates)
+        )
+        if df == 0:
+            return None
+        new_rate = rate - f / df
+        if abs(new_rate - rate) < 1e-6:
+            return new_rate
+        rate = new_rate
+    return rate
+
+
+def sip_cashflows(nav_df, sip_amount=5000, years=5):
+    """
+    Cashflows and dates of the old compute_sip_xirr. Returns (cashflows,
+    dates the old code used, dates the instalments were actually made on);
+    the two date lists differ when instalments before the first NAV are skipped.
+    """
+    end_date = nav_df["date"].iloc[-1]
+    start_date = end_date - relativedelta(years=years)
+    nav_df = nav_df[nav_df["date"] >= start_date].copy()
+    sip_dates = pd.date_range(start=start_date, end=end_date, freq='MS')
+    cashflows = []
+    paid = []
+    units = 0
+    for date in sip_dates:
+        nav_on_date = nav_df[nav_df["date"] <= date]["nav"]
+        if len(nav_on_date) == 0:
+            continue
+        units += sip_amount / nav_on_date.iloc[-1]
+        cashflows.append(-sip_amount)
+        paid.append(date)
+    cashflows.append(units * nav_df["nav"].iloc[-1])
+    return cashflows, list(sip_dates[:len(cashflows) - 1]) + [end_date], paid + [end_date]
+
+
+def compute_sip_xirr(nav_df, sip_amount=5000, years=5):
+    cashflows, dates, _ = sip_cashflows(nav_df, sip_amount, years)
+    rate = xirr(cashflows, dates)
+    return rate * 100 if rate is not None else np.nan
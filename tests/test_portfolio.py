@@ -0,0 +1,86 @@
+from math import comb
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_universe
+from mf_analytics.panel import align_navs
+from mf_analytics.portfolio import backtest, rebalance_rows, sip_xirr, weight_grid
+from mf_analytics.sip import simulate_sip
+from tests import reference
+
+
+@pytest.fixture(scope="module")
+def navs():
+    dates, _, matrix = align_navs(synthetic_universe(3, min_years=4, max_years=8, seed=11))
+    return dates, matrix
+
+
+def simulate(nav, weights, rebalance_at=(), band=None):
+    """Day-by-day portfolio value for one weight vector, holding units and resetting them explicitly."""
+    units = weights / nav[0]
+    values, resets = [], 0
+    for t in range(len(nav)):
+        holdings = units * nav[t]
+        total = holdings.sum()
+        values.append(total)
+        drifted = band is not None and np.abs(holdings / total - weights).max() > band
+        if t in rebalance_at or drifted:
+            units = total * weights / nav[t]
+            resets += 1
+    return np.array(values) / values[0] * 100, resets
+
+
+WEIGHTS = np.array([[0.5, 0.3, 0.2], [0.2, 0.2, 0.6], [1.0, 0.0, 0.0]])
+
+
+def test_buy_and_hold(navs):
+    dates, matrix = navs
+    _, values, rebalances = backtest(dates, matrix, WEIGHTS)
+    start = ~np.isnan(matrix).any(axis=1)
+    for k, w in enumerate(WEIGHTS):
+        expected, _ = simulate(matrix[start], w)
+        np.testing.assert_allclose(values[:, k], expected, rtol=1e-10)
+    assert not rebalances.any()
+
+
+@pytest.mark.parametrize("frequency", ["monthly", "quarterly", "yearly"])
+def test_calendar(navs, frequency):
+    dates, matrix = navs
+    run_dates, values, rebalances = backtest(dates, matrix, WEIGHTS, rule="calendar", frequency=frequency)
+    start = ~np.isnan(matrix).any(axis=1)
+    anchors = set(rebalance_rows(run_dates, frequency).tolist())
+    for k, w in enumerate(WEIGHTS):
+        expected, _ = simulate(matrix[start], w, rebalance_at=anchors)
+        np.testing.assert_allclose(values[:, k], expected, rtol=1e-10)
+    assert (rebalances == len(anchors)).all()
+
+
+def test_band(navs):
+    dates, matrix = navs
+    _, values, rebalances = backtest(dates, matrix, WEIGHTS, rule="band", band=0.05)
+    start = ~np.isnan(matrix).any(axis=1)
+    for k, w in enumerate(WEIGHTS):
+        expected, resets = simulate(matrix[start], w, band=0.05)
+        np.testing.assert_allclose(values[:, k], expected, rtol=1e-10)
+        assert rebalances[k] == resets
+
+
+def test_sip_xirr_matches_scalar(navs):
+    dates, matrix = navs
+    run_dates, values, _ = backtest(dates, matrix, WEIGHTS, rule="calendar")
+    rates = sip_xirr(run_dates, values, amount=5000, years=3)
+    for k in range(len(WEIGHTS)):
+        sip = simulate_sip(pd.DataFrame({"date": run_dates, "nav": values[:, k]}), amount=5000, years=3)
+        assert rates[k] == pytest.approx(reference.xirr(sip.cashflows, list(sip.dates)) * 100, abs=1e-4)
+
+
+@pytest.mark.parametrize("n_funds, step", [(2, 0.1), (3, 0.25), (4, 0.2)])
+def test_weight_grid(n_funds, step):
+    grid = weight_grid(n_funds, step)
+    units = round(1 / step)
+    assert len(grid) == comb(units + n_funds - 1, n_funds - 1)
+    np.testing.assert_allclose(grid.sum(axis=1), 1)
+    assert len({tuple(np.round(row / step).astype(int)) for row in grid}) == len(grid)
+    assert (weight_grid(n_funds, step, min_weight=step) >= step - 1e-12).all()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_nav, synthetic_universe
+from mf_analytics.metrics import compute_rolling_cagr
+from mf_analytics.rolling import horizon_label, rolling_cagr
+from tests import reference
+
+
+def asof_cagr(nav_df, years):
+    """Rolling CAGR one date at a time: NAV against the last NAV on or before the date `years` earlier."""
+    nav = nav_df.set_index("date")["nav"]
+    out = []
+    for date, value in nav.items():
+        past = nav[:date - pd.DateOffset(years=years)]
+        out.append(((value / past.iloc[-1]) ** (1 / years) - 1) * 100 if len(past) else np.nan)
+    return pd.Series(out, index=nav.index)
+
+
+@pytest.mark.parametrize("years", [1, 3, 5])
+def test_matches_asof_reference(years):
+    nav_df = synthetic_nav(8, seed=7)
+    result = rolling_cagr({"fund": nav_df}, horizons=(years,))["fund"][horizon_label(years)]
+    np.testing.assert_allclose(result.to_numpy(), asof_cagr(nav_df, years).to_numpy(), rtol=1e-12)
+
+
+def test_matches_old_shift_on_daily_series():
+    # With one NAV per calendar day and no 29 February inside any window,
+    # shift(365) rows is exactly one calendar year, so the old code is right here
+    dates = pd.date_range("2021-01-01", "2023-12-31", freq="D")
+    wiggle = np.sin(np.arange(len(dates)) / 9) / 50
+    nav_df = pd.DataFrame({"date": dates, "nav": 10 * np.exp(np.linspace(0, 0.4, len(dates)) + wiggle)})
+    old = reference.compute_rolling_cagr(nav_df, years=1)
+    new = compute_rolling_cagr(nav_df, years=1)
+    assert list(new.index) == list(old.index)
+    np.testing.assert_allclose(new.to_numpy(), old.to_numpy(), rtol=1e-12)
+
+
+def test_batch_matches_single_fund():
+    universe = synthetic_universe(6, min_years=1, max_years=12, seed=3)
+    batch = rolling_cagr(universe)
+    for name, nav_df in universe.items():
+        single = rolling_cagr({name: nav_df})[name]
+        pd.testing.assert_frame_equal(batch[name], single)
+
+
+def test_young_fund_is_nan():
+    nav_df = synthetic_nav(2, seed=1)
+    result = rolling_cagr({"fund": nav_df}, horizons=(1, 3))["fund"]
+    assert result["3Y"].isna().all()
+    assert result["1Y"].notna().any()
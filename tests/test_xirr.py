@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_nav
+from mf_analytics.metrics import compute_sip_xirr
+from mf_analytics.xirr import xirr, xirr_batch, xirr_ragged, year_fractions
+from tests import reference
+
+CASHFLOWS = [
+    # Monthly SIP over a year, redeemed at a gain
+    ([-5000] * 12 + [64000], list(pd.date_range("2020-01-01", periods=12, freq="MS")) + [pd.Timestamp("2021-01-01")]),
+    # Lumpsum at a loss
+    ([-100000, 82000], [pd.Timestamp("2019-03-15"), pd.Timestamp("2022-07-01")]),
+    # Short history: three instalments and an early redemption
+    ([-5000, -5000, -5000, 15900], list(pd.date_range("2024-04-01", periods=3, freq="MS")) + [pd.Timestamp("2024-06-20")]),
+    # Irregular amounts and a partial withdrawal
+    ([-10000, -2500, 3000, -7000, 19500],
+     [pd.Timestamp(d) for d in ("2018-01-10", "2018-09-03", "2019-05-20", "2020-02-14", "2023-11-30")]),
+]
+
+
+@pytest.mark.parametrize("cashflows, dates", CASHFLOWS)
+def test_xirr_matches_reference(cashflows, dates):
+    assert xirr(cashflows, dates) == pytest.approx(reference.xirr(cashflows, dates), abs=1e-6)
+
+
+def test_batch_matches_scalar():
+    expected = [reference.xirr(cf, dates) for cf, dates in CASHFLOWS]
+    np.testing.assert_allclose(xirr_ragged(CASHFLOWS), expected, atol=1e-6)
+
+
+def test_bisection_fallback_finds_root():
+    # Newton from 10% overshoots below -100% on this deep loss; bisection must still find the rate
+    cashflows = np.array([-1000.0, 0.0, 5.0])
+    times = year_fractions(pd.to_datetime(["2020-01-01", "2020-06-01", "2021-01-01"]))
+    rate = xirr_batch(cashflows, times)[0]
+    assert np.isfinite(rate)
+    assert (cashflows * (1 + rate) ** -times).sum() == pytest.approx(0, abs=1e-3)
+
+
+def test_no_sign_change_is_nan():
+    assert xirr([-1000, -500], pd.to_datetime(["2020-01-01", "2021-01-01"])) is None
+
+
+@pytest.mark.parametrize("years, seed", [(10, 1), (6, 2), (5.5, 3)])
+def test_sip_xirr_matches_reference(years, seed):
+    nav_df = synthetic_nav(years, seed=seed)
+    rate, _ = compute_sip_xirr(nav_df)
+    assert rate == pytest.approx(reference.compute_sip_xirr(nav_df), abs=1e-4)
+
+
+@pytest.mark.parametrize("years, seed", [(2, 3), (1.2, 4), (0.3, 5)])
+def test_sip_xirr_short_history(years, seed):
+    # With less history than the SIP window the old code skipped the missing
+    # months but then dated the remaining cashflows from the window start. The
+    # cashflows are the same; only their dates were shifted, so the old results
+    # were wrong and the new ones match the old solver on the real dates.
+    nav_df = synthetic_nav(years, seed=seed)
+    rate, sip = compute_sip_xirr(nav_df)
+    cashflows, _, paid = reference.sip_cashflows(nav_df)
+    np.testing.assert_allclose(sip.cashflows, cashflows)
+    assert list(sip.dates) == list(pd.DatetimeIndex(paid))
+    assert rate == pytest.approx(reference.xirr(cashflows, paid) * 100, abs=1e-4)
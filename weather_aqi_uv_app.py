@@ -1,9 +1,10 @@
 import streamlit as st
-import requests
 import pandas as pd
 import altair as alt
 import folium
 from streamlit_folium import st_folium
+from concurrent.futures import as_completed
+from weather_client import WAQI_TILE, ApiError, get_client
 
 # ============================================================
 # PAGE CONFIG
@@ -24,48 +25,14 @@ if "unit" not in st.session_state:
     st.session_state.unit = "Celsius"
 
 # ============================================================
-# API CONFIG
+# API CLIENT
 # ============================================================
-WEATHER_API_KEY = "9da2d5cbd6e548b1aa7171028250912"
-WAQI_TOKEN = "ac73ef45573497db6e37f3135880f86ba063caf1"
-
-W_CURRENT = "https://api.weatherapi.com/v1/current.json"
-W_FORECAST = "https://api.weatherapi.com/v1/forecast.json"
-W_ASTRO = "https://api.weatherapi.com/v1/astronomy.json"
-WAQI_API = "https://api.waqi.info/feed/"
-WAQI_TILE = f"https://tiles.waqi.info/tiles/usepa-aqi/{{z}}/{{x}}/{{y}}.png?token={WAQI_TOKEN}"
+# Pooled, retried and cached; shared with the other dashboards
+client = get_client()
 
 # ============================================================
 # HELPERS
 # ============================================================
-@st.cache_data(ttl=1800)
-def get_current(city):
-    return requests.get(
-        f"{W_CURRENT}?key={WEATHER_API_KEY}&q={city}&aqi=yes",
-        timeout=10
-    ).json()
-
-@st.cache_data(ttl=1800)
-def get_forecast(city):
-    return requests.get(
-        f"{W_FORECAST}?key={WEATHER_API_KEY}&q={city}&days=2",
-        timeout=10
-    ).json()
-
-@st.cache_data(ttl=1800)
-def get_astronomy(city):
-    return requests.get(
-        f"{W_ASTRO}?key={WEATHER_API_KEY}&q={city}",
-        timeout=10
-    ).json()
-
-@st.cache_data(ttl=1800)
-def get_aqi(city):
-    return requests.get(
-        f"{WAQI_API}{city}/?token={WAQI_TOKEN}",
-        timeout=10
-    ).json()
-
 def aqi_category(aqi):
     aqi = int(aqi)
     if aqi <= 50: return ("Good", "green")
@@ -125,39 +92,30 @@ if submit and city_input:
     st.session_state.unit = unit_input
 
 # ============================================================
-# DASHBOARD
+# DASHBOARD SECTIONS
 # ============================================================
-if st.session_state.city:
-    city = st.session_state.city
-    unit = st.session_state.unit
-
-    weather = get_current(city)
-    if "current" not in weather:
-        st.error("City not found or API error")
-        st.stop()
-
+def show_weather(snapshot, city, unit):
     # ---------------- WEATHER ----------------
-    loc_data = weather.get("location", {})
-    loc = loc_data.get("name", city)
-    country = loc_data.get("country", "")
-    localtime = loc_data.get("localtime", "N/A")
-
-    temp = weather["current"]["temp_c"] if unit == "Celsius" else weather["current"]["temp_f"]
-    feels = weather["current"]["feelslike_c"] if unit == "Celsius" else weather["current"]["feelslike_f"]
-    uv = weather["current"]["uv"]
-    humidity = weather["current"]["humidity"]
-    visibility = weather["current"].get("vis_km", "N/A")
-    pressure = weather["current"].get("pressure_mb", "N/A")
-    wind = weather["current"]["wind_kph"]
-    icon = "https:" + weather["current"]["condition"]["icon"]
-    condition = weather["current"]["condition"]["text"]
-   
+    loc_data = snapshot.location
+    loc = loc_data.name or city
+    country = loc_data.country
+    localtime = loc_data.localtime
+
+    now = snapshot.current
+    temp = now.temp_c if unit == "Celsius" else now.temp_f
+    feels = now.feelslike_c if unit == "Celsius" else now.feelslike_f
+    uv = now.uv
+    humidity = now.humidity
+    visibility = now.vis_km
+    pressure = now.pressure_mb
+    wind = now.wind_kph
+    icon = now.icon
+    condition = now.condition
+
     uv_label, uv_color = uv_category(uv)
 
     # ---------------- ASTRONOMY ----------------
-    astro = get_astronomy(city)
-    sunrise = astro.get("astronomy", {}).get("astro", {}).get("sunrise", "N/A")
-    sunset = astro.get("astronomy", {}).get("astro", {}).get("sunset", "N/A")
+    sunrise, sunset = snapshot.astro.sunrise, snapshot.astro.sunset
 
     st.subheader(f"🌤️ Weather in 🌍 {loc}, {country}\n 📅 **Current Date / Time**: {localtime}")
 
@@ -165,11 +123,11 @@ if st.session_state.city:
     st.markdown(f"### {condition}")
     st.metric("🌡️ Temperature", f"{temp}° {unit[0]}")
     st.metric("🤔 Feels Like", f"{feels}° {unit[0]}")
-    
+
     col1, col2 = st.columns(2)
     col1.metric("💧 Humidity", f"{humidity}%")
     col2.metric("💨 Wind", f"{wind} km/h")
-    
+
     col1, col2 = st.columns(2)
     col1.metric("🌅 Sunrise", sunrise)
     col2.metric("🌇 Sunset", sunset)
@@ -183,17 +141,15 @@ if st.session_state.city:
         unsafe_allow_html=True
     )
 
-    # ========================================================
-    # HOURLY CHART
-    # ========================================================
-    forecast = get_forecast(city)
+def show_hourly(snapshot, unit):
     rows = []
-    for day in forecast["forecast"]["forecastday"]:
-        for h in day["hour"]:
-            rows.append({
-                "time": h["time"],
-                "temp": h["temp_c"] if unit == "Celsius" else h["temp_f"]
-            })
+    for h in snapshot.hours:
+        rows.append({
+            "time": h.time,
+            "temp": h.temp_c if unit == "Celsius" else h.temp_f
+        })
+    if not rows:
+        return
 
     df = pd.DataFrame(rows)
     df["time"] = pd.to_datetime(df["time"])
@@ -206,61 +162,52 @@ if st.session_state.city:
         width='stretch'
     )
 
-    # ========================================================
-    # AQI DASHBOARD
-    # ========================================================
+def show_aqi(air):
     st.markdown("### 🌫 Air Quality Index")
+    if air is None or air.aqi is None:
+        return
+
+    aqi = air.aqi
+    label, color = aqi_category(aqi)
+
+    st.markdown(
+        f"<div style='background:{color};padding:16px;border-radius:12px;text-align:center;color:white;'>"
+        f"<h2>AQI {aqi}</h2><p>{label}</p></div>",
+        unsafe_allow_html=True
+    )
+
+    pollutants = air.pollutants
+
+    pollutant_map = {
+        "pm25": "PM2.5",
+        "pm10": "PM10",
+        "o3": "Ozone (O₃)",
+        "no2": "Nitrogen Dioxide (NO₂)",
+        "so2": "Sulfur Dioxide (SO₂)",
+        "co": "Carbon Monoxide (CO)"
+    }
 
-    # ================= AQI DATA =================
-    aqi_data = get_aqi(city)
-
-    if aqi_data.get("status") == "ok":
-        aqi = aqi_data["data"]["aqi"]
-        label, color = aqi_category(aqi)
-
-        st.markdown(
-            f"<div style='background:{color};padding:16px;border-radius:12px;text-align:center;color:white;'>"
-            f"<h2>AQI {aqi}</h2><p>{label}</p></div>",
-            unsafe_allow_html=True
-        )
-
-        pollutants = aqi_data["data"].get("iaqi", {})
-
-        pollutant_map = {
-            "pm25": "PM2.5",
-            "pm10": "PM10",
-            "o3": "Ozone (O₃)",
-            "no2": "Nitrogen Dioxide (NO₂)",
-            "so2": "Sulfur Dioxide (SO₂)",
-            "co": "Carbon Monoxide (CO)"
-        }
-
-        st.markdown("#### 🧪 Pollutant Concentrations")
-        cols = st.columns(2)
-        for i, (key, label) in enumerate(pollutant_map.items()):
-            value = pollutants.get(key, {}).get("v", "N/A")
-            cols[i % 2].metric(label, f"{value} µg/m³")
-
-    # ========================================================
-    # HEALTH ALERTS
-    # ========================================================
+    st.markdown("#### 🧪 Pollutant Concentrations")
+    cols = st.columns(2)
+    for i, (key, label) in enumerate(pollutant_map.items()):
+        value = pollutants.get(key, "N/A")
+        cols[i % 2].metric(label, f"{value} µg/m³")
+
+def show_alerts(air, uv):
     st.markdown("## 🩺 Health Alerts")
 
     # AQI Alert
-    if aqi_data.get("status") == "ok":
-        aqi_val = aqi_data["data"]["aqi"]
-        msg, level = aqi_health_alert(aqi_val)
+    if air is not None and air.aqi is not None:
+        msg, level = aqi_health_alert(air.aqi)
         getattr(st, level)(f"🌫️ AQI Alert: {msg}")
 
     # UV Alert
     uv_msg, uv_level = uv_health_alert(uv)
     getattr(st, uv_level)(f"☀️ UV Alert: {uv_msg}")
 
-    # ========================================================
-    # MAP
-    # ========================================================
-    lat = weather["location"]["lat"]
-    lon = weather["location"]["lon"]
+def show_map(snapshot, city):
+    lat = snapshot.location.lat
+    lon = snapshot.location.lon
 
     st.markdown("### 🌍 Interactive AQI Map")
     m = folium.Map(location=[lat, lon], zoom_start=5)
@@ -268,6 +215,47 @@ if st.session_state.city:
     folium.Marker([lat, lon], tooltip=city).add_to(m)
     st_folium(m, height=350, width="100%")
 
+
+# ============================================================
+# DASHBOARD
+# ============================================================
+if st.session_state.city:
+    city = st.session_state.city
+    unit = st.session_state.unit
+
+    # Both upstream calls start now; one forecast call feeds every weather
+    # panel. Slots keep the page order while sections fill in as data arrives.
+    snapshot_future, air_future = client.fetch_city(city, days=2)
+    weather_slot, hourly_slot, aqi_slot, alerts_slot, map_slot = (st.empty() for _ in range(5))
+    weather_slot.caption("Loading weather…")
+    aqi_slot.caption("Loading air quality…")
+
+    snapshot = air = None
+    for future in as_completed([snapshot_future, air_future]):
+        if future is snapshot_future:
+            try:
+                snapshot = future.result()
+            except ApiError:
+                aqi_slot.empty()
+                weather_slot.error("City not found or API error")
+                st.stop()
+            with weather_slot.container():
+                show_weather(snapshot, city, unit)
+            with hourly_slot.container():
+                show_hourly(snapshot, unit)
+            with map_slot.container():
+                show_map(snapshot, city)
+        else:
+            try:
+                air = future.result()
+            except ApiError:
+                air = None
+            with aqi_slot.container():
+                show_aqi(air)
+
+    with alerts_slot.container():
+        show_alerts(air, snapshot.current.uv)
+
 # Footer
     st.info(
         "🌐 Data Source: Global AQI tiles from [WAQI](https://waqi.info/). "
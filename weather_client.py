@@ -0,0 +1,349 @@
+"""
+Shared WeatherAPI and WAQI client for the weather and AQI dashboards.
+
+One pooled keep-alive session, the same timeouts everywhere, retries with
+jittered exponential backoff, typed results and one TTL cache per process,
+so every dashboard gets the same behaviour and a fix here reaches all of
+them. Requests go through mf_analytics.transport, so they can be recorded,
+replayed or pointed at benchmarks.mockserver like the MF tool's.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import requests
+
+from mf_analytics.transport import transport_adapter
+
+WEATHER_API_KEY = os.environ.get("WEATHER_API_KEY", "9da2d5cbd6e548b1aa7171028250912")
+WAQI_TOKEN = os.environ.get("WAQI_TOKEN", "ac73ef45573497db6e37f3135880f86ba063caf1")
+
+WEATHER_URL = "https://api.weatherapi.com/v1/"
+WAQI_URL = "https://api.waqi.info/feed/"
+WAQI_TILE = f"https://tiles.waqi.info/tiles/usepa-aqi/{{z}}/{{x}}/{{y}}.png?token={WAQI_TOKEN}"
+
+# (connect, read) seconds
+TIMEOUT = (3.05, 10)
+# Attempts after the first; waits are uniform in [0, BACKOFF * 2**attempt] seconds
+RETRIES = 3
+BACKOFF = 0.3
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+# WAQI error messages that mean the city is unknown; others ("Invalid key", "Over quota") are API errors
+WAQI_NOT_FOUND = ("unknown station", "unknown city")
+# Pooled keep-alive connections per host, and threads for concurrent calls
+POOL_SIZE = 8
+# Seconds a response stays cached; air quality stations update more often
+WEATHER_TTL = 1800
+AQI_TTL = 600
+CACHE_ENTRIES = 512
+
+
+class ApiError(Exception):
+    """An upstream call failed after retries or returned an error body."""
+
+
+class CityNotFound(ApiError):
+    """The API does not know the requested city or station."""
+
+
+class Location(NamedTuple):
+    name: str
+    country: str
+    lat: float
+    lon: float
+    localtime: str            # "YYYY-MM-DD HH:MM" in the city's time zone
+
+
+class Conditions(NamedTuple):
+    time: Optional[str]       # hour of a forecast row; None for current conditions
+    temp_c: float
+    temp_f: float
+    feelslike_c: float
+    feelslike_f: float
+    humidity: float
+    wind_kph: float
+    vis_km: Optional[float]
+    pressure_mb: Optional[float]
+    uv: Optional[float]
+    condition: str
+    icon: str                 # absolute URL
+    air_quality: dict         # WeatherAPI's air_quality block, empty unless aqi=yes
+
+
+class Astro(NamedTuple):
+    sunrise: str
+    sunset: str
+    moonrise: str
+    moonset: str
+
+
+class DayForecast(NamedTuple):
+    date: str
+    avgtemp_c: float
+    avgtemp_f: float
+    maxtemp_c: float
+    mintemp_c: float
+    avghumidity: float
+    maxwind_kph: float
+    uv: Optional[float]
+    condition: str
+    icon: str
+    astro: Astro
+    hours: list               # of Conditions
+
+
+class Weather(NamedTuple):
+    location: Location
+    current: Optional[Conditions]
+    days: list                # of DayForecast, empty for current.json
+
+
+class Snapshot(NamedTuple):
+    """Every WeatherAPI panel of a city dashboard, derived from one forecast.json call."""
+    location: Location
+    current: Conditions       # with air_quality, so also the UV and WeatherAPI AQI panels
+    astro: Astro              # today's, in the city's time zone
+    hours: list               # Conditions for every forecast hour, oldest first
+    days: list                # of DayForecast
+
+
+class AirQuality(NamedTuple):
+    aqi: Optional[int]        # None when the station does not report an overall AQI
+    station: str
+    pollutants: dict          # WAQI iaqi key (pm25, pm10, o3, ...) -> value
+    dominant: Optional[str]
+    time: Optional[str]
+    lat: Optional[float]
+    lon: Optional[float]
+
+
+def _icon(condition):
+    icon = condition.get("icon", "")
+    return "https:" + icon if icon.startswith("//") else icon
+
+
+def parse_conditions(data):
+    condition = data.get("condition", {})
+    return Conditions(
+        time=data.get("time"),
+        temp_c=data.get("temp_c"),
+        temp_f=data.get("temp_f"),
+        feelslike_c=data.get("feelslike_c"),
+        feelslike_f=data.get("feelslike_f"),
+        humidity=data.get("humidity"),
+        wind_kph=data.get("wind_kph"),
+        vis_km=data.get("vis_km"),
+        pressure_mb=data.get("pressure_mb"),
+        uv=data.get("uv"),
+        condition=condition.get("text", "N/A"),
+        icon=_icon(condition),
+        air_quality=data.get("air_quality", {}),
+    )
+
+
+def parse_astro(data):
+    return Astro(*(data.get(k, "N/A") for k in Astro._fields))
+
+
+def parse_weather(data):
+    """Weather from a current.json or forecast.json response."""
+    loc = data.get("location", {})
+    days = []
+    for day in data.get("forecast", {}).get("forecastday", []):
+        summary = day.get("day", {})
+        condition = summary.get("condition", {})
+        days.append(DayForecast(
+            date=day.get("date"),
+            avgtemp_c=summary.get("avgtemp_c"),
+            avgtemp_f=summary.get("avgtemp_f"),
+            maxtemp_c=summary.get("maxtemp_c"),
+            mintemp_c=summary.get("mintemp_c"),
+            avghumidity=summary.get("avghumidity"),
+            maxwind_kph=summary.get("maxwind_kph"),
+            uv=summary.get("uv"),
+            condition=condition.get("text", "N/A"),
+            icon=_icon(condition),
+            astro=parse_astro(day.get("astro", {})),
+            hours=[parse_conditions(h) for h in day.get("hour", [])],
+        ))
+    return Weather(
+        location=Location(
+            name=loc.get("name", ""),
+            country=loc.get("country", ""),
+            lat=loc.get("lat"),
+            lon=loc.get("lon"),
+            localtime=loc.get("localtime", "N/A"),
+        ),
+        current=parse_conditions(data["current"]) if "current" in data else None,
+        days=days,
+    )
+
+
+def parse_air_quality(data):
+    """AirQuality from a WAQI feed response."""
+    if data.get("status") != "ok":
+        message = str(data.get("data") or "no data")
+        raise (CityNotFound if message.lower() in WAQI_NOT_FOUND else ApiError)(f"WAQI: {message}")
+    feed = data.get("data", {})
+    aqi = feed.get("aqi")
+    geo = feed.get("city", {}).get("geo") or [None, None]
+    return AirQuality(
+        aqi=int(aqi) if isinstance(aqi, (int, float)) or str(aqi).isdigit() else None,
+        station=feed.get("city", {}).get("name", "N/A"),
+        pollutants={k: v.get("v") for k, v in feed.get("iaqi", {}).items() if isinstance(v, dict)},
+        dominant=feed.get("dominentpol"),
+        time=feed.get("time", {}).get("s"),
+        lat=geo[0],
+        lon=geo[1],
+    )
+
+
+class TTLCache:
+    """Small thread-safe cache whose entries expire; the oldest entry goes first when full."""
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.items = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None or item[0] < time.monotonic():
+                self.items.pop(key, None)
+                return None
+            return item[1]
+
+    def put(self, key, value, ttl):
+        with self.lock:
+            self.items.pop(key, None)
+            while len(self.items) >= self.max_entries:
+                self.items.pop(next(iter(self.items)))
+            self.items[key] = (time.monotonic() + ttl, value)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+class WeatherClient:
+    """Typed, cached access to WeatherAPI (current, forecast, astronomy) and WAQI (air quality)."""
+
+    def __init__(self, weather_key=WEATHER_API_KEY, waqi_token=WAQI_TOKEN, session=None,
+                 timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF):
+        self.weather_key = weather_key
+        self.waqi_token = waqi_token
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = TTLCache()
+        if session is None:
+            # Retries live in _get_json so they can be jittered; the adapter only pools
+            session = requests.Session()
+            adapter = transport_adapter(pool_connections=2, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.pool = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="weather")
+
+    def _get_json(self, url, params):
+        """GET `url` and decode JSON, retrying connection errors, timeouts, 429 and 5xx."""
+        for attempt in range(self.retries + 1):
+            try:
+                r = self.session.get(url, params=params, timeout=self.timeout)
+                if r.status_code not in RETRY_STATUS:
+                    return r.status_code, r.json()
+                error = ApiError(f"{url} returned HTTP {r.status_code}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = ApiError(f"{url} could not be reached: {e}")
+            except ValueError as e:
+                raise ApiError(f"{url} returned invalid JSON") from e
+            if attempt < self.retries:
+                time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+        raise error
+
+    def _cached(self, key, ttl, fetch):
+        value = self.cache.get(key)
+        if value is None:
+            value = fetch()
+            self.cache.put(key, value, ttl)
+        return value
+
+    def _weather(self, endpoint, city, **params):
+        def fetch():
+            status, data = self._get_json(WEATHER_URL + endpoint, {"key": self.weather_key, "q": city, **params})
+            if "error" in data:
+                message = data["error"].get("message", "WeatherAPI error")
+                raise (CityNotFound if data["error"].get("code") == 1006 else ApiError)(message)
+            if status != 200:
+                raise ApiError(f"WeatherAPI returned HTTP {status}")
+            return data
+        key = (endpoint, city.strip().lower(), tuple(sorted(params.items())))
+        return self._cached(key, WEATHER_TTL, fetch)
+
+    def current(self, city, aqi=True):
+        """Current conditions (with WeatherAPI's air quality block when `aqi`)."""
+        return parse_weather(self._weather("current.json", city, aqi="yes" if aqi else "no"))
+
+    def forecast(self, city, days=2, aqi=False, alerts=False):
+        """Current conditions plus `days` daily forecasts with hourly rows and astro data."""
+        return parse_weather(self._weather(
+            "forecast.json", city, days=days, aqi="yes" if aqi else "no", alerts="yes" if alerts else "no",
+        ))
+
+    def snapshot(self, city, days=2):
+        """
+        Snapshot of `city` from a single forecast call with air quality: the
+        forecast response already carries current conditions and each day's
+        astro data, so current.json and astronomy.json are not needed.
+        """
+        weather = self.forecast(city, days=days, aqi=True)
+        if weather.current is None or not weather.days:
+            raise ApiError(f"WeatherAPI returned no forecast for {city}")
+        return Snapshot(
+            location=weather.location,
+            current=weather.current,
+            astro=weather.days[0].astro,
+            hours=[h for day in weather.days for h in day.hours],
+            days=weather.days,
+        )
+
+    def fetch_city(self, city, days=2):
+        """
+        Start the snapshot and WAQI calls for `city` at once on the client's
+        thread pool and return their futures as (snapshot, air_quality), so a
+        cold page waits for the slowest call rather than the sum of them.
+        Futures raise ApiError like the calls they wrap.
+        """
+        return (
+            self.pool.submit(self.snapshot, city, days),
+            self.pool.submit(self.air_quality, city),
+        )
+
+    def astronomy(self, city, date=None):
+        """Sunrise, sunset, moonrise and moonset for `date` (YYYY-MM-DD, today by default)."""
+        params = {"dt": date} if date else {}
+        return parse_astro(self._weather("astronomy.json", city, **params).get("astronomy", {}).get("astro", {}))
+
+    def air_quality(self, city):
+        """WAQI air quality for the station that best matches `city`."""
+        def fetch():
+            _, data = self._get_json(f"{WAQI_URL}{city.strip()}/", {"token": self.waqi_token})
+            return parse_air_quality(data)
+        return self._cached(("waqi", city.strip().lower()), AQI_TTL, fetch)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, so every dashboard session shares its pool and cache."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = WeatherClient()
+        return _default
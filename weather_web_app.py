@@ -1,7 +1,7 @@
 import streamlit as st
-import requests
 import pandas as pd
 import altair as alt
+from weather_client import ApiError, CityNotFound, get_client
 
 # -------------------------------------
 # STREAMLIT CONFIG
@@ -9,29 +9,20 @@ import altair as alt
 st.set_page_config(page_title='Weather App', layout='centered')
 st.title('Weather App')
 
-api_key = "9da2d5cbd6e548b1aa7171028250912"
-
-current_url = "http://api.weatherapi.com/v1/current.json"
-forecast_url = "http://api.weatherapi.com/v1/forecast.json"
-astro_url = "http://api.weatherapi.com/v1/astronomy.json"
+client = get_client()
 
 # -------------------------------------
-# CACHING (prevents repeated API calls)
+# API CALLS (weather_client pools, retries and caches them)
 # -------------------------------------
-@st.cache_data(show_spinner=True, ttl=3600)  # cache for 1 hour
-def get_current_weather(city):
-    url = f"{current_url}?key={api_key}&q={city}&aqi=yes"
-    return requests.get(url).json()
-
-@st.cache_data(show_spinner=True, ttl=3600)
-def get_forecast(city, days=7):
-    url = f"{forecast_url}?key={api_key}&q={city}&days={days}&aqi=no&alerts=no"
-    return requests.get(url).json()
-
-@st.cache_data(show_spinner=True, ttl=3600)
-def get_astro(city, date):
-    url = f"{astro_url}?key={api_key}&q={city}&dt={date}"
-    return requests.get(url).json()
+def fetch(call, *args, **kwargs):
+    """Run a client call, or show why it failed and stop the page."""
+    try:
+        return call(*args, **kwargs)
+    except CityNotFound:
+        st.error("City Not Found")
+    except ApiError as e:
+        st.error(f"Weather service unavailable: {e}")
+    st.stop()
 
 
 # -------------------------------------
@@ -49,28 +40,22 @@ city = st.text_input("Enter City Name:")
 # -------------------------------------
 if st.button("Get Weather") and city:
 
-    # ------------------- CURRENT WEATHER -------------------
-    data = get_current_weather(city)
+    # One forecast call feeds the current, astronomy and 7-day sections
+    snapshot = fetch(client.snapshot, city, days=7)
 
-    if "error" in data:
-        st.error("City Not Found")
-        st.write("API Response:", data)
-        st.stop()
-
-    loc = data['location']['name']
-    country = data['location']['country']
-    local_dt = data['location']['localtime']
-    local_date = local_dt.split(" ")[0]
+    # ------------------- CURRENT WEATHER -------------------
+    loc = snapshot.location.name
+    country = snapshot.location.country
+    local_dt = snapshot.location.localtime
 
-    temp_c = data['current']['temp_c']
-    temp_f = data['current']['temp_f']
-    temp = temp_c if unit == "Celsius" else temp_f
+    now = snapshot.current
+    temp = now.temp_c if unit == "Celsius" else now.temp_f
 
-    humidity = data['current']['humidity']
-    visibility = data['current']['vis_km']
-    wind = data['current']['wind_kph']
-    cond = data['current']['condition']['text']
-    icon = "https:" + data['current']['condition']['icon']
+    humidity = now.humidity
+    visibility = now.vis_km
+    wind = now.wind_kph
+    cond = now.condition
+    icon = now.icon
 
     # Display
     st.subheader(f"{loc}, {country}")
@@ -90,40 +75,37 @@ if st.button("Get Weather") and city:
         st.write(f"💨 **Wind Speed:** {wind} km/h")
 
     # ------------------- SUNRISE & SUNSET -------------------
-    astro = get_astro(city, local_date)
-    sunrise = astro['astronomy']['astro']['sunrise']
-    sunset = astro['astronomy']['astro']['sunset']
+    sunrise = snapshot.astro.sunrise
+    sunset = snapshot.astro.sunset
 
     st.markdown("### 🌅 Astronomical Information")
     st.write(f"🌄 **Sunrise:** {sunrise}")
     st.write(f"🌇 **Sunset:** {sunset}")
 
     # ------------------- 7-DAY FORECAST -------------------
-    forecast_data = get_forecast(city, days=7)
+    forecast_days = snapshot.days
 
-    if "forecast" in forecast_data:
+    if forecast_days:
         st.markdown("## 📆 7-Day Weather Forecast")
 
-        forecast_days = forecast_data['forecast']['forecastday']
-
         # Build DataFrame for charts
         df = pd.DataFrame([
             {
-                "date": day["date"],
-                "temp_c": day["day"]["avgtemp_c"],
-                "temp_f": day["day"]["avgtemp_f"],
-                "humidity": day["day"]["avghumidity"],
-                "wind_kph": day["day"]["maxwind_kph"],
-                "condition": day["day"]["condition"]["text"]
+                "date": day.date,
+                "temp_c": day.avgtemp_c,
+                "temp_f": day.avgtemp_f,
+                "humidity": day.avghumidity,
+                "wind_kph": day.maxwind_kph,
+                "condition": day.condition
             } for day in forecast_days
         ])
 
         # Cards Display
         for day in forecast_days:
-            st.write(f"### 📅 {day['date']}")
-            st.write(f"🌡️ Avg Temp: {day['day']['avgtemp_c']}°C / {day['day']['avgtemp_f']}°F")
-            st.write(f"💧 Humidity: {day['day']['avghumidity']}%")
-            st.write(f"💨 Max Wind: {day['day']['maxwind_kph']} km/h")
+            st.write(f"### 📅 {day.date}")
+            st.write(f"🌡️ Avg Temp: {day.avgtemp_c}°C / {day.avgtemp_f}°F")
+            st.write(f"💧 Humidity: {day.avghumidity}%")
+            st.write(f"💨 Max Wind: {day.maxwind_kph} km/h")
             st.write("---")
 
         # ------------------- CHARTS -------------------